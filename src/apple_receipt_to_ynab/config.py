@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+import sys
 from pathlib import Path
 from typing import Any
 
@@ -19,6 +21,7 @@ from apple_receipt_to_ynab.models import (
 
 ALLOWED_MATCH_TYPES = {"exact", "contains", "regex"}
 ALLOWED_FLAG_COLORS = {"red", "orange", "yellow", "green", "blue", "purple"}
+_FLAG_COLORS = {color: sys.intern(color) for color in ALLOWED_FLAG_COLORS}
 ALLOWED_APP_MODES = {"local", "email"}
 DEFAULT_YNAB_API_URL = "https://api.ynab.com/v1"
 DEFAULT_YNAB_LOOKBACK_DAYS = 7
@@ -29,6 +32,10 @@ DEFAULT_EMAIL_MAX_RESULTS = 10
 DEFAULT_EMAIL_SERVICE_ACCOUNT_KEY_PATH = Path("~/.asy/gmail-service-account.json").expanduser()
 DEFAULT_APP_LOG_PATH = Path("~/.asy/asy.log").expanduser()
 
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_config_cache: dict[Path, tuple[tuple[int, int, int, int], RuntimeConfig]] = {}
+
 
 class ConfigError(ValueError):
     pass
@@ -46,8 +53,22 @@ def _format_yaml_error(exc: Exception) -> str:
 
 
 def load_config(path: Path) -> RuntimeConfig:
+    stat = path.stat()
+    # An in-place edit that keeps the size and lands within the filesystem's
+    # timestamp resolution is indistinguishable here and returns the cached
+    # config; editors that replace the file change the inode instead.
+    file_key = (stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+    cached = _config_cache.get(path)
+    if cached is not None and cached[0] == file_key:
+        return cached[1]
+    config = load_config_from_text(path.read_text(encoding="utf-8"), source_path=path)
+    _config_cache[path] = (file_key, config)
+    return config
+
+
+def load_config_from_text(text: str, source_path: Path = Path("config.yaml")) -> RuntimeConfig:
     try:
-        raw = yaml.safe_load(path.read_text(encoding="utf-8"))
+        raw = yaml.load(text, Loader=_YAML_LOADER)
     except yaml.YAMLError as exc:
         raise _config_error(_format_yaml_error(exc)) from exc
     if not isinstance(raw, dict):
@@ -79,7 +100,7 @@ def load_config(path: Path) -> RuntimeConfig:
         log_path=Path(log_path).expanduser() if log_path else DEFAULT_APP_LOG_PATH,
     )
 
-    email = _parse_email(path=path, raw=raw.get("email"), app_mode=app_mode)
+    email = _parse_email(path=source_path, raw=raw.get("email"), app_mode=app_mode)
 
     mappings_raw = _required_mapping(raw, "mappings")
     mappings = _parse_mappings(version=version, raw=mappings_raw)
@@ -170,7 +191,11 @@ def _parse_rule(raw: Any) -> MappingRule:
     match_type = _required_str(match_raw, "type")
     if match_type not in ALLOWED_MATCH_TYPES:
         raise _config_error(f"Unsupported 'match.type' value '{match_type}'.")
-    match = MatchSpec(type=match_type, value=_required_str(match_raw, "value"))
+    match_value = _required_str(match_raw, "value")
+    try:
+        match = MatchSpec(type=match_type, value=match_value)
+    except re.error as exc:
+        raise _config_error(f"Invalid regex '{match_value}' in 'match.value': {exc}.") from exc
 
     return MappingRule(
         id=_required_str(raw, "id"),
@@ -225,8 +250,8 @@ def _optional_flag_color(raw: dict[str, Any], key: str) -> str | None:
     value = _optional_str(raw, key)
     if value is None:
         return None
-    normalized = value.lower()
-    if normalized not in ALLOWED_FLAG_COLORS:
+    normalized = _FLAG_COLORS.get(value.lower())
+    if normalized is None:
         allowed = ", ".join(sorted(ALLOWED_FLAG_COLORS))
         raise _config_error(f"'{key}' must be one of: {allowed}.")
     return normalized
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import base64
 from dataclasses import dataclass
+from functools import lru_cache
 
 from apple_receipt_to_ynab.models import EmailConfig
 
@@ -18,6 +19,7 @@ class GmailMessage:
     raw_bytes: bytes
 
 
+@lru_cache(maxsize=64)
 def build_gmail_query(
     subject_filter: str,
     sender_filter: str,
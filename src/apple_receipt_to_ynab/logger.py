@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import atexit
 import json
+import os
+import threading
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, BinaryIO, Iterable
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - stdlib json fallback
+    orjson = None  # type: ignore[assignment]
 
 try:
     from rich.console import Console
@@ -11,11 +19,14 @@ except ModuleNotFoundError:  # pragma: no cover - covered by fallback behavior t
 
 _STDOUT_CONSOLE = Console() if Console is not None else None
 
+_log_handles: dict[Path, BinaryIO] = {}
+_log_handles_lock = threading.Lock()
+
 
 def print_structured_stdout(value: dict[str, Any] | list[Any] | str) -> None:
     if isinstance(value, str):
         try:
-            parsed = json.loads(value)
+            parsed = orjson.loads(value) if orjson is not None else json.loads(value)
         except json.JSONDecodeError:
             print(value)
             return
@@ -24,7 +35,7 @@ def print_structured_stdout(value: dict[str, Any] | list[Any] | str) -> None:
 
     if _STDOUT_CONSOLE is not None:
         try:
-            _STDOUT_CONSOLE.print_json(json=json.dumps(parsed, ensure_ascii=True, sort_keys=True))
+            _STDOUT_CONSOLE.print_json(json=_dumps_sorted(parsed))
             return
         except Exception:
             pass
@@ -36,10 +47,7 @@ def append_log_block(path: Path | None, lines: Iterable[str], echo_stdout: bool
     log_lines = list(lines)
 
     if path is not None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("a", encoding="utf-8") as handle:
-            for line in log_lines:
-                handle.write(f"{line}\n")
+        _write_log_bytes(path, "".join(f"{line}\n" for line in log_lines).encode("utf-8"))
 
     if path is None or echo_stdout:
         for line in log_lines:
@@ -47,12 +55,65 @@ def append_log_block(path: Path | None, lines: Iterable[str], echo_stdout: bool
 
 
 def append_log_event(path: Path | None, event: dict[str, Any], echo_stdout: bool = False) -> None:
-    line = json.dumps(event, ensure_ascii=True, separators=(",", ":"), sort_keys=True)
+    append_log_events(path, [event], echo_stdout=echo_stdout)
+
+
+def append_log_events(path: Path | None, events: Iterable[dict[str, Any]], echo_stdout: bool = False) -> None:
+    log_events = list(events)
+    if not log_events:
+        return
 
     if path is not None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("a", encoding="utf-8") as handle:
-            handle.write(f"{line}\n")
+        _write_log_bytes(path, b"".join(_serialize_log_event(event) for event in log_events))
 
     if path is None or echo_stdout:
-        print_structured_stdout(event)
+        for event in log_events:
+            print_structured_stdout(event)
+
+
+def _write_log_bytes(path: Path, data: bytes) -> None:
+    with _log_handles_lock:
+        handle = _log_handles.get(path)
+        if handle is not None and not _is_current_log_handle(path, handle):
+            handle.close()
+            handle = None
+        if handle is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handle = path.open("ab")
+            _log_handles[path] = handle
+        handle.write(data)
+        handle.flush()
+
+
+def _is_current_log_handle(path: Path, handle: BinaryIO) -> bool:
+    if handle.closed:
+        return False
+    try:
+        path_stat = path.stat()
+    except OSError:
+        return False
+    handle_stat = os.fstat(handle.fileno())
+    return (path_stat.st_dev, path_stat.st_ino) == (handle_stat.st_dev, handle_stat.st_ino)
+
+
+def _close_log_handles() -> None:
+    with _log_handles_lock:
+        for handle in _log_handles.values():
+            handle.close()
+        _log_handles.clear()
+
+
+atexit.register(_close_log_handles)
+
+
+def _serialize_log_event(event: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(event, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE)
+    line = json.dumps(event, ensure_ascii=False, separators=(",", ":"), sort_keys=True, default=str)
+    return f"{line}\n".encode("utf-8")
+
+
+def _dumps_sorted(value: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
@@ -1,12 +1,10 @@
 from __future__ import annotations
 
-import re
+from dataclasses import dataclass
 
-from apple_receipt_to_ynab.models import MappingConfig, MatchedSubscription, SubscriptionLine
+from apple_receipt_to_ynab.models import MappingConfig, MappingRule, MatchedSubscription, SubscriptionLine
 from apple_receipt_to_ynab.utils import clean_text
 
-MATCH_ORDER = ("exact", "contains", "regex")
-
 
 class MappingMatchError(ValueError):
     pass
@@ -16,14 +14,22 @@ class UnmappedSubscriptionError(MappingMatchError):
     pass
 
 
+@dataclass(frozen=True)
+class _RuleIndex:
+    exact: dict[str, MappingRule]
+    contains: list[MappingRule]
+    regex: list[MappingRule]
+
+
 def match_subscriptions(
     subscriptions: list[SubscriptionLine], config: MappingConfig
 ) -> list[MatchedSubscription]:
     matched: list[MatchedSubscription] = []
     unmatched: list[str] = []
+    rule_index = _build_rule_index(config)
 
     for sub in subscriptions:
-        rule = _find_rule(clean_text(sub.description), config)
+        rule = _find_rule(clean_text(sub.description), rule_index)
         if rule is None:
             if config.fallback and config.fallback.enabled:
                 category_id = config.fallback.ynab_category_id or config.defaults.ynab_category_id
@@ -65,17 +71,31 @@ def match_subscriptions(
     return matched
 
 
-def _find_rule(description: str, config: MappingConfig):
+def _build_rule_index(config: MappingConfig) -> _RuleIndex:
+    exact: dict[str, MappingRule] = {}
+    contains: list[MappingRule] = []
+    regex: list[MappingRule] = []
+    for rule in config.rules:
+        if not rule.enabled:
+            continue
+        if rule.match.type == "exact":
+            exact.setdefault(rule.match.value, rule)
+        elif rule.match.type == "contains":
+            contains.append(rule)
+        elif rule.match.type == "regex":
+            regex.append(rule)
+    return _RuleIndex(exact=exact, contains=contains, regex=regex)
+
+
+def _find_rule(description: str, rule_index: _RuleIndex) -> MappingRule | None:
     normalized = description.strip()
-    for match_type in MATCH_ORDER:
-        for rule in config.rules:
-            if not rule.enabled or rule.match.type != match_type:
-                continue
-            pattern = rule.match.value
-            if match_type == "exact" and normalized == pattern:
-                return rule
-            if match_type == "contains" and pattern in normalized:
-                return rule
-            if match_type == "regex" and re.search(pattern, normalized):
-                return rule
+    rule = rule_index.exact.get(normalized)
+    if rule is not None:
+        return rule
+    for rule in rule_index.contains:
+        if rule.match.value in normalized:
+            return rule
+    for rule in rule_index.regex:
+        if rule.match.pattern.search(normalized):
+            return rule
     return None
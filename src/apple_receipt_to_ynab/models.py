@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+import sys
+from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
 from pathlib import Path
@@ -10,13 +12,13 @@ MatchType = Literal["exact", "contains", "regex"]
 AppMode = Literal["local", "email"]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SubscriptionLine:
     description: str
     base_amount: Decimal
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ParsedReceipt:
     source_pdf: Path
     receipt_id: str
@@ -28,13 +30,20 @@ class ParsedReceipt:
     raw_text: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MatchSpec:
     type: MatchType
     value: str
+    pattern: re.Pattern[str] | None = field(init=False, default=None, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        if self.type == "exact":
+            object.__setattr__(self, "value", sys.intern(self.value))
+        elif self.type == "regex":
+            object.__setattr__(self, "pattern", re.compile(self.value))
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class MappingRule:
     id: str
     enabled: bool
@@ -44,7 +53,7 @@ class MappingRule:
     ynab_payee_id: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MappingDefaults:
     ynab_account_id: str
     ynab_category_id: str | None = None
@@ -52,7 +61,7 @@ class MappingDefaults:
     default_currency: str = "USD"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FallbackMapping:
     enabled: bool
     ynab_category_id: str | None = None
@@ -61,7 +70,7 @@ class FallbackMapping:
     ynab_flag_color: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MappingConfig:
     version: int
     defaults: MappingDefaults
@@ -103,7 +112,7 @@ class RuntimeConfig:
     mappings: MappingConfig
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MatchedSubscription:
     source_description: str
     base_amount: Decimal
@@ -112,8 +121,13 @@ class MatchedSubscription:
     ynab_payee_name: str
     mapping_rule_id: str
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "ynab_category_id", sys.intern(self.ynab_category_id))
+        object.__setattr__(self, "ynab_payee_name", sys.intern(self.ynab_payee_name))
+        object.__setattr__(self, "mapping_rule_id", sys.intern(self.mapping_rule_id))
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class SplitLine:
     source_description: str
     base_milliunits: int
@@ -7,11 +7,17 @@ from decimal import Decimal, InvalidOperation
 from email import policy
 from email.message import Message
 from email.parser import BytesParser
+from functools import lru_cache
 from pathlib import Path
 
 from apple_receipt_to_ynab.models import ParsedReceipt, SubscriptionLine
 from apple_receipt_to_ynab.utils import clean_text
 
+
+def _combine_patterns(patterns: tuple[re.Pattern[str], ...]) -> re.Pattern[str]:
+    return re.compile("|".join(f"(?:{pattern.pattern})" for pattern in patterns), re.IGNORECASE)
+
+
 AMOUNT_PATTERN = re.compile(r"(?P<amount>[-+]?\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})|[-+]?\$?\d+\.\d{2})")
 AMOUNT_REGEX_TEXT = r"[-+]?\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})|[-+]?\$?\d+\.\d{2}"
 CURRENCY_AMOUNT_PATTERN = re.compile(r"\$\s?\d{1,3}(?:,\d{3})*(?:\.\d{2})")
@@ -39,6 +45,7 @@ IGNORE_LINE_PATTERNS = (
     re.compile(r"^page\s+\d+\s+of\s+\d+", re.IGNORECASE),
     re.compile(r"\bprinted by\b", re.IGNORECASE),
 )
+IGNORE_LINE_PATTERN = _combine_patterns(IGNORE_LINE_PATTERNS)
 TOTAL_LINE_PATTERNS = (
     re.compile(r"\bgrand\s*total\b", re.IGNORECASE),
     re.compile(r"\bamount\s*charged\b", re.IGNORECASE),
@@ -48,21 +55,26 @@ TAX_LINE_PATTERNS = (
     re.compile(r"\btax\b", re.IGNORECASE),
     re.compile(r"\bvat\b", re.IGNORECASE),
 )
+TOTAL_LINE_PATTERN = _combine_patterns(TOTAL_LINE_PATTERNS)
+TAX_LINE_PATTERN = _combine_patterns(TAX_LINE_PATTERNS)
 DATE_CANDIDATE_PATTERN = re.compile(
     r"\b(\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{2,4}|[A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})\b"
 )
 DEFAULT_RECEIPT_PREFIX = "RECEIPT"
+AMOUNT_CACHE_MAX_ENTRIES = 1024
 LEADING_EMAIL_NOISE_PATTERNS = (
     re.compile(r"^(from|to|subject|sent|date|cc|bcc)\s*:", re.IGNORECASE),
     re.compile(r"^on .+ wrote:$", re.IGNORECASE),
     re.compile(r"^page\s+\d+\s+of\s+\d+", re.IGNORECASE),
     re.compile(r"^sent from my", re.IGNORECASE),
 )
+LEADING_EMAIL_NOISE_PATTERN = _combine_patterns(LEADING_EMAIL_NOISE_PATTERNS)
 SECTION_START_HINT_PATTERNS = (
     RECEIPT_ID_PATTERN,
     re.compile(r"\b(receipt|invoice|document\s*(?:no|number))\b", re.IGNORECASE),
     re.compile(r"\b(apple|app\s*store|itunes)\b", re.IGNORECASE),
 )
+SECTION_START_HINT_PATTERN = _combine_patterns(SECTION_START_HINT_PATTERNS)
 SECTION_SCAN_WINDOW_LINES = 160
 SECTION_TOTAL_FOOTER_BUFFER_LINES = 12
 SUBSCRIPTION_TABLE_PATTERN = re.compile(
@@ -72,6 +84,7 @@ SUBSCRIPTION_TABLE_PATTERN = re.compile(
 P_TAG_CONTENT_PATTERN = re.compile(r"<p\b[^>]*>(.*?)</p>", re.IGNORECASE | re.DOTALL)
 STYLE_SCRIPT_PATTERN = re.compile(r"<(style|script)\b[^>]*>.*?</\1>", re.IGNORECASE | re.DOTALL)
 HTML_TAG_PATTERN = re.compile(r"<[^>]+>", re.DOTALL)
+HTML_BR_PATTERN = re.compile(r"<\s*br\s*/?\s*>", re.IGNORECASE)
 HTML_COMMENT_PATTERN = re.compile(r"<!--.*?-->", re.DOTALL)
 PAYMENT_INFORMATION_SECTION_PATTERN = re.compile(
     r"<div[^>]*class=\"[^\"]*payment-information[^\"]*\"[^>]*>.*?(?=<div\s+id=\"footer_section\")",
@@ -89,6 +102,9 @@ DATE_LABEL_BLOB_PATTERN = re.compile(
 )
 
 
+_amount_cache: dict[str, Decimal] = {}
+
+
 class ReceiptParseError(ValueError):
     pass
 
@@ -114,7 +130,7 @@ def parse_receipt_bytes(
     default_currency: str = "USD",
 ) -> ParsedReceipt:
     source_path = source_name if isinstance(source_name, Path) else Path(str(source_name))
-    message = BytesParser(policy=policy.default).parsebytes(raw_bytes)
+    message = BytesParser(policy=policy.compat32).parsebytes(raw_bytes)
     return _parse_receipt_message(message, source_path=source_path, default_currency=default_currency)
 
 
@@ -146,8 +162,8 @@ def parse_receipt_text(
     receipt_date = _extract_date(lines)
     currency = _extract_currency(lines, default_currency)
 
-    tax_total = _extract_named_amount(lines, TAX_LINE_PATTERNS)
-    grand_total = _extract_named_amount(lines, TOTAL_LINE_PATTERNS, exclude_patterns=TAX_LINE_PATTERNS)
+    tax_total = _extract_named_amount(lines, TAX_LINE_PATTERN)
+    grand_total = _extract_named_amount(lines, TOTAL_LINE_PATTERN, exclude_pattern=TAX_LINE_PATTERN)
     if grand_total is None:
         raise ReceiptParseError("Could not find grand total in receipt text.")
     if tax_total is None:
@@ -245,7 +261,7 @@ def _extract_subscriptions_from_html(body_html: str) -> list[SubscriptionLine]:
         if amount is None:
             continue
 
-        description_tokens = [token for token in tokens if _extract_last_amount(token) is None]
+        description_tokens = [token for token in tokens if not _has_amount(token)]
         description = _compose_subscription_description(description_tokens)
         if not description:
             continue
@@ -274,7 +290,7 @@ def _extract_subscriptions_from_item_rows(body_html: str) -> list[SubscriptionLi
         if amount is None:
             continue
 
-        description_tokens = [token for token in row_lines if _extract_last_amount(token) is None]
+        description_tokens = [token for token in row_lines if not _has_amount(token)]
         description = _compose_subscription_description(description_tokens)
         if not description:
             continue
@@ -398,8 +414,7 @@ def _find_amount_after_label(tokens: list[str], labels: set[str]) -> Decimal | N
 
 def _extract_labeled_amount_from_line(line: str, labels: set[str]) -> Decimal | None:
     for label in labels:
-        pattern = re.compile(rf"\b{re.escape(label)}\b[^\d$-+]*({AMOUNT_REGEX_TEXT})", re.IGNORECASE)
-        match = pattern.search(line)
+        match = _labeled_amount_pattern(label).search(line)
         if not match:
             continue
         amount = _parse_amount(match.group(1))
@@ -408,6 +423,11 @@ def _extract_labeled_amount_from_line(line: str, labels: set[str]) -> Decimal |
     return None
 
 
+@lru_cache(maxsize=None)
+def _labeled_amount_pattern(label: str) -> re.Pattern[str]:
+    return re.compile(rf"\b{re.escape(label)}\b[^\d$-+]*({AMOUNT_REGEX_TEXT})", re.IGNORECASE)
+
+
 def _extract_receipt_id_from_text_blob(text: str) -> str | None:
     match = ORDER_ID_BLOB_PATTERN.search(text)
     if not match:
@@ -428,7 +448,7 @@ def _strip_style_and_script(html: str) -> str:
 
 def _html_to_plain_text(fragment_html: str) -> str:
     value = HTML_COMMENT_PATTERN.sub(" ", fragment_html)
-    value = re.sub(r"<\s*br\s*/?\s*>", "\n", value, flags=re.IGNORECASE)
+    value = HTML_BR_PATTERN.sub("\n", value)
     value = HTML_TAG_PATTERN.sub(" ", value)
     value = html_lib.unescape(value)
     return value
@@ -472,14 +492,14 @@ def _extract_currency(lines: list[str], default_currency: str) -> str:
 
 def _extract_named_amount(
     lines: list[str],
-    patterns: tuple[re.Pattern[str], ...],
-    exclude_patterns: tuple[re.Pattern[str], ...] = (),
+    pattern: re.Pattern[str],
+    exclude_pattern: re.Pattern[str] | None = None,
 ) -> Decimal | None:
     amounts: list[Decimal] = []
     for line in lines:
-        if exclude_patterns and any(pattern.search(line) for pattern in exclude_patterns):
+        if exclude_pattern is not None and exclude_pattern.search(line):
             continue
-        if not any(pattern.search(line) for pattern in patterns):
+        if not pattern.search(line):
             continue
         amount = _extract_last_amount(line)
         if amount is not None:
@@ -492,7 +512,7 @@ def _extract_named_amount(
 def _extract_subscription_lines(lines: list[str]) -> list[SubscriptionLine]:
     subscriptions: list[SubscriptionLine] = []
     for line in lines:
-        if any(pattern.search(line) for pattern in IGNORE_LINE_PATTERNS):
+        if IGNORE_LINE_PATTERN.search(line):
             continue
         amount = _extract_last_amount(line)
         if amount is None:
@@ -512,6 +532,10 @@ def _extract_last_amount(line: str) -> Decimal | None:
     return _parse_amount(matches[-1].group("amount"))
 
 
+def _has_amount(line: str) -> bool:
+    return AMOUNT_PATTERN.search(line) is not None
+
+
 def _strip_last_amount(line: str) -> str:
     matches = list(AMOUNT_PATTERN.finditer(line))
     if not matches:
@@ -521,10 +545,17 @@ def _strip_last_amount(line: str) -> str:
 
 def _parse_amount(raw: str) -> Decimal | None:
     cleaned = raw.replace("$", "").replace(",", "").strip()
+    amount = _amount_cache.get(cleaned)
+    if amount is not None:
+        return amount
     try:
-        return Decimal(cleaned)
+        amount = Decimal(cleaned)
     except InvalidOperation:
         return None
+    if len(_amount_cache) >= AMOUNT_CACHE_MAX_ENTRIES:
+        _amount_cache.clear()
+    _amount_cache[cleaned] = amount
+    return amount
 
 
 def _strip_leading_email_noise(lines: list[str]) -> list[str]:
@@ -532,7 +563,7 @@ def _strip_leading_email_noise(lines: list[str]) -> list[str]:
     max_scan = min(len(lines), 80)
     while idx < max_scan:
         line = lines[idx]
-        if any(pattern.search(line) for pattern in LEADING_EMAIL_NOISE_PATTERNS):
+        if LEADING_EMAIL_NOISE_PATTERN.search(line):
             idx += 1
             continue
         if line.startswith(">"):
@@ -549,8 +580,8 @@ def _focus_receipt_section(lines: list[str]) -> list[str]:
     candidate_indexes = [
         idx
         for idx, line in enumerate(lines[:240])
-        if any(pattern.search(line) for pattern in SECTION_START_HINT_PATTERNS)
-        and not any(pattern.search(line) for pattern in LEADING_EMAIL_NOISE_PATTERNS)
+        if SECTION_START_HINT_PATTERN.search(line)
+        and not LEADING_EMAIL_NOISE_PATTERN.search(line)
     ]
     for start_idx in candidate_indexes:
         end_idx = min(len(lines), start_idx + SECTION_SCAN_WINDOW_LINES)
@@ -561,9 +592,9 @@ def _focus_receipt_section(lines: list[str]) -> list[str]:
         total_line_offsets = [
             offset
             for offset, line in enumerate(window)
-            if any(pattern.search(line) for pattern in TOTAL_LINE_PATTERNS)
-            and not any(pattern.search(line) for pattern in TAX_LINE_PATTERNS)
-            and _extract_last_amount(line) is not None
+            if TOTAL_LINE_PATTERN.search(line)
+            and not TAX_LINE_PATTERN.search(line)
+            and _has_amount(line)
         ]
         if total_line_offsets:
             focused_end = min(
@@ -581,10 +612,10 @@ def _focus_receipt_section(lines: list[str]) -> list[str]:
 def _window_looks_like_receipt(window: list[str]) -> bool:
     if not window:
         return False
-    amount_line_count = sum(1 for line in window if _extract_last_amount(line) is not None)
-    has_tax = _extract_named_amount(window, TAX_LINE_PATTERNS) is not None
+    amount_line_count = sum(1 for line in window if _has_amount(line))
+    has_tax = _extract_named_amount(window, TAX_LINE_PATTERN) is not None
     has_total = (
-        _extract_named_amount(window, TOTAL_LINE_PATTERNS, exclude_patterns=TAX_LINE_PATTERNS)
+        _extract_named_amount(window, TOTAL_LINE_PATTERN, exclude_pattern=TAX_LINE_PATTERN)
         is not None
     )
     return amount_line_count >= 3 and has_tax and has_total
@@ -1,32 +1,101 @@
 from __future__ import annotations
 
+import atexit
+import json
+import os
+import random
 import socket
+import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from apple_receipt_to_ynab.config import load_config
 from apple_receipt_to_ynab.gmail_client import GmailMessage, fetch_gmail_messages
-from apple_receipt_to_ynab.logger import append_log_event
+from apple_receipt_to_ynab.logger import append_log_event, append_log_events
 from apple_receipt_to_ynab.matcher import match_subscriptions
 from apple_receipt_to_ynab.models import MappingConfig, MatchedSubscription, ParsedReceipt, RuntimeConfig, SplitLine, SubscriptionLine
 from apple_receipt_to_ynab.parser import parse_receipt_bytes, parse_receipt_file
 from apple_receipt_to_ynab.tax import build_split_lines
-from apple_receipt_to_ynab.utils import dollars_to_milliunits, milliunits_to_dollars, now_local_iso
-from apple_receipt_to_ynab.ynab import YnabApiError, build_parent_transaction
+from apple_receipt_to_ynab.utils import dollars_to_milliunits, now_local_iso
+from apple_receipt_to_ynab.ynab import YnabApiError, build_parent_transaction, build_receipt_memo
 
 YNAB_REQUEST_TIMEOUT_SECONDS = 10
+GMAIL_BATCH_MAX_WORKERS = 5
+YNAB_DELETE_MAX_WORKERS = 4
 YNAB_MAX_RETRIES = 2
+YNAB_MAX_RATE_LIMIT_RETRIES = 4
 YNAB_RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+YNAB_RETRY_BASE_DELAY_SECONDS = 0.25
+YNAB_RETRY_MAX_DELAY_SECONDS = 10.0
+YNAB_CONNECTION_POOL_MAXSIZE = 16
+YNAB_TRANSACTION_CACHE_FILENAME = "ynab-transactions-cache.json"
+YNAB_TRANSACTION_CACHE_VERSION = 1
+
+_YNAB_DELETE_FAILURE_SUFFIX = (
+    "The new split transaction may already exist and some duplicate uncleared transactions may remain."
+)
+_YNAB_ERROR_MESSAGES: dict[str, tuple[str, str, str]] = {
+    "create_transaction": (
+        "Could not connect to the YNAB API while creating the transaction. "
+        "We could not confirm whether YNAB saved the transaction. "
+        "Please check YNAB before retrying.",
+        "No transaction was created.",
+        "Could not create the YNAB transaction",
+    ),
+    "update_transaction": (
+        "Could not connect to the YNAB API while updating the existing transaction. "
+        "No new transaction was created.",
+        "No new transaction was created.",
+        "Could not update the existing YNAB transaction",
+    ),
+    "delete_transaction": (
+        "Could not connect to the YNAB API while deleting matched duplicate transactions. "
+        + _YNAB_DELETE_FAILURE_SUFFIX,
+        _YNAB_DELETE_FAILURE_SUFFIX,
+        "Could not delete matched duplicate YNAB transactions",
+    ),
+    "list_transactions": (
+        "Could not connect to the YNAB API while loading existing transactions. No actions were taken.",
+        "No actions were taken.",
+        "Could not load transactions from YNAB",
+    ),
+}
+
+try:
+    from urllib3 import exceptions as _urllib3_exceptions
+except Exception:  # pragma: no cover - urllib3 ships with the ynab SDK
+    _URLLIB3_CONNECTIVITY_EXCEPTION_TYPES: tuple[type[BaseException], ...] = ()
+else:
+    _URLLIB3_CONNECTIVITY_EXCEPTION_TYPES = (
+        _urllib3_exceptions.ConnectTimeoutError,
+        _urllib3_exceptions.MaxRetryError,
+        _urllib3_exceptions.NewConnectionError,
+        _urllib3_exceptions.ProtocolError,
+        _urllib3_exceptions.ReadTimeoutError,
+    )
+_CONNECTIVITY_EXCEPTION_TYPES = (
+    TimeoutError,
+    ConnectionError,
+    socket.timeout,
+    *_URLLIB3_CONNECTIVITY_EXCEPTION_TYPES,
+)
+
+_ynab_module: Any = None
+_ynab_api_clients: dict[tuple[str, str], Any] = {}
+_ynab_api_clients_lock = threading.Lock()
 
 
 class ValidationError(ValueError):
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProcessResult:
     status: str
     message: str
@@ -40,7 +109,7 @@ class ProcessResult:
     failed_count: int = 0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class YnabTransactionCandidate:
     transaction_id: str
     date_value: date
@@ -102,6 +171,8 @@ def _process_local_file_receipt(
     existing_candidates = _load_existing_uncleared_transaction_candidates(
         runtime_config=runtime_config,
         account_id=config.defaults.ynab_account_id,
+        log_to_stdout=log_to_stdout,
+        dry_run=dry_run,
     )
     return _process_parsed_receipt(
         receipt=receipt,
@@ -141,27 +212,54 @@ def _process_gmail_batch(runtime_config: RuntimeConfig, dry_run: bool, log_to_st
             failed_count=0,
         )
 
-    existing_candidates = _load_existing_uncleared_transaction_candidates(
-        runtime_config=runtime_config,
-        account_id=config.defaults.ynab_account_id,
-    )
-    processed_count = 0
-    created_count = 0
-    duplicate_count = 0
-    for message in gmail_messages:
-        parsed = _parse_gmail_message(message, default_currency=config.defaults.default_currency)
-        result = _process_parsed_receipt(
-            receipt=parsed,
-            runtime_config=runtime_config,
-            dry_run=dry_run,
-            existing_candidates=existing_candidates,
-            log_to_stdout=log_to_stdout,
+    receipt_log_events: list[list[dict[str, Any]]] = [[] for _ in gmail_messages]
+    batch_log_events: list[dict[str, Any]] = []
+    try:
+        with ThreadPoolExecutor(max_workers=GMAIL_BATCH_MAX_WORKERS) as executor:
+            # Only poll YNAB once there is mail to reconcile, overlapping the
+            # lookup with message parsing.
+            candidates_future = executor.submit(
+                _load_existing_uncleared_transaction_candidates,
+                runtime_config=runtime_config,
+                account_id=config.defaults.ynab_account_id,
+                log_to_stdout=log_to_stdout,
+                dry_run=dry_run,
+            )
+
+            def _process_message(index: int) -> ProcessResult:
+                receipt = _parse_gmail_message(
+                    gmail_messages[index], default_currency=config.defaults.default_currency
+                )
+                return _process_parsed_receipt(
+                    receipt=receipt,
+                    runtime_config=runtime_config,
+                    dry_run=dry_run,
+                    existing_candidates=candidates_future.result(),
+                    log_to_stdout=log_to_stdout,
+                    log_events=receipt_log_events[index],
+                )
+
+            receipt_results, failure = _run_gmail_receipts(executor, len(gmail_messages), _process_message)
+        if failure is not None:
+            candidates_error = candidates_future.exception()
+            if candidates_error is not None:
+                raise candidates_error
+            failed_index, exc = failure
+            batch_log_events.append(
+                _build_gmail_batch_stopped_event(gmail_messages, receipt_results, failed_index, dry_run)
+            )
+            raise exc
+    finally:
+        append_log_events(
+            log_path,
+            [event for log_events in receipt_log_events for event in log_events] + batch_log_events,
+            echo_stdout=dry_run,
         )
-        processed_count += 1
-        if result.status == "created":
-            created_count += 1
-        elif result.status == "duplicate":
-            duplicate_count += 1
+
+    results = [result for result in receipt_results if result is not None]
+    processed_count = len(results)
+    created_count = sum(1 for result in results if result.status == "created")
+    duplicate_count = sum(1 for result in results if result.status == "duplicate")
 
     status = "DRY_RUN" if dry_run else "created"
     message = (
@@ -181,6 +279,71 @@ def _process_gmail_batch(runtime_config: RuntimeConfig, dry_run: bool, log_to_st
     )
 
 
+def _run_gmail_receipts(
+    executor: ThreadPoolExecutor,
+    receipt_count: int,
+    process: Callable[[int], ProcessResult],
+) -> tuple[list[ProcessResult | None], tuple[int, Exception] | None]:
+    # Stop handing out receipts after the first failure so a bad receipt
+    # cannot leave an arbitrary subset of the batch posted.
+    results: list[ProcessResult | None] = [None] * receipt_count
+    failure: tuple[int, Exception] | None = None
+    pending: dict[Future[ProcessResult], int] = {}
+    next_index = 0
+    while pending or (failure is None and next_index < receipt_count):
+        while failure is None and next_index < receipt_count and len(pending) < GMAIL_BATCH_MAX_WORKERS:
+            pending[executor.submit(process, next_index)] = next_index
+            next_index += 1
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            exc = future.exception()
+            if exc is None:
+                results[index] = future.result()
+            elif failure is None or index < failure[0]:
+                failure = (index, exc)
+    return results, failure
+
+
+def _build_gmail_batch_stopped_event(
+    messages: list[GmailMessage],
+    results: list[ProcessResult | None],
+    failed_index: int,
+    dry_run: bool,
+) -> dict[str, Any]:
+    posted_receipts = [
+        {
+            "message_id": message.message_id,
+            "receipt_id": result.receipt_id,
+            "transaction_id": result.transaction_id,
+        }
+        for message, result in zip(messages, results)
+        if result is not None and result.status == "created"
+    ]
+    unprocessed_message_ids = [
+        message.message_id
+        for index, (message, result) in enumerate(zip(messages, results))
+        if result is None and index != failed_index
+    ]
+    failed_message_id = messages[failed_index].message_id
+    posted_ids = ", ".join(item["receipt_id"] for item in posted_receipts) or "none"
+    return {
+        "timestamp": now_local_iso(),
+        "event_name": "gmail_batch_stopped",
+        "source_label": "email://batch",
+        "mode": "dry_run" if dry_run else "live_post",
+        "status": "failed",
+        "failed_message_id": failed_message_id,
+        "posted_receipts": posted_receipts,
+        "unprocessed_message_ids": unprocessed_message_ids,
+        "message": (
+            f"Gmail batch stopped after message {failed_message_id} failed. "
+            f"Already written to YNAB: {posted_ids}. "
+            f"Not processed: {', '.join(unprocessed_message_ids) or 'none'}."
+        ),
+    }
+
+
 def _parse_gmail_message(message: GmailMessage, default_currency: str) -> ParsedReceipt:
     source_name = Path(f"gmail-{message.message_id}.eml")
     return parse_receipt_bytes(
@@ -196,6 +359,7 @@ def _process_parsed_receipt(
     dry_run: bool,
     existing_candidates: list[YnabTransactionCandidate],
     log_to_stdout: bool = False,
+    log_events: list[dict[str, Any]] | None = None,
 ) -> ProcessResult:
     config = runtime_config.mappings
     matched = match_subscriptions(receipt.subscriptions, config)
@@ -210,7 +374,7 @@ def _process_parsed_receipt(
         grand_total_milliunits=grand_total_milliunits,
         ynab_flag_color=_resolve_ynab_flag_color(config, matched),
     )
-    _validate_totals(receipt, split_lines, transaction["amount"])
+    _validate_totals(split_lines, grand_total_milliunits, transaction["amount"])
 
     status = "DRY_RUN"
     message = "Dry run completed. No write actions were taken."
@@ -221,11 +385,13 @@ def _process_parsed_receipt(
     matched_uncleared_count = 0
     deleted_duplicate_count = 0
     reused_transaction_id: str | None = None
-    planned_matches = _plan_uncleared_line_matches(
-        split_lines=split_lines,
-        grand_total_milliunits=grand_total_milliunits,
-        candidates=existing_candidates,
-    )
+    planned_matches: list[PlannedLineMatch] = []
+    if existing_candidates:
+        planned_matches = _plan_uncleared_line_matches(
+            split_lines=split_lines,
+            grand_total_milliunits=grand_total_milliunits,
+            sorted_candidates=existing_candidates,
+        )
     matched_uncleared_count = len(planned_matches)
 
     if dry_run:
@@ -273,13 +439,7 @@ def _process_parsed_receipt(
             ynab_action = "created"
             if len(split_lines) > 1:
                 delete_ids = sorted({match.transaction_id for match in planned_matches})
-                for delete_id in delete_ids:
-                    _delete_ynab_transaction(
-                        ynab_budget_id=runtime_config.ynab.budget_id,
-                        ynab_api_token=runtime_config.ynab.api_token,
-                        ynab_api_url=runtime_config.ynab.api_url,
-                        transaction_id=delete_id,
-                    )
+                _delete_ynab_transactions(runtime_config=runtime_config, transaction_ids=delete_ids)
                 deleted_duplicate_count = len(delete_ids)
                 duplicate_count = deleted_duplicate_count
                 message = (
@@ -289,24 +449,25 @@ def _process_parsed_receipt(
             else:
                 message = f"Posted transaction {transaction_id}."
 
-    append_log_event(
-        None if log_to_stdout else runtime_config.app.log_path,
-        _build_log_event(
-            receipt=receipt,
-            split_lines=split_lines,
-            ynab_budget_id=runtime_config.ynab.budget_id,
-            ynab_account_id=config.defaults.ynab_account_id,
-            status=status,
-            message=message,
-            transaction_id=transaction_id,
-            dry_run=dry_run,
-            ynab_action=ynab_action,
-            matched_uncleared_count=matched_uncleared_count,
-            deleted_duplicate_count=deleted_duplicate_count,
-            reused_transaction_id=reused_transaction_id,
-        ),
-        echo_stdout=dry_run,
+    event = _build_log_event(
+        receipt=receipt,
+        split_lines=split_lines,
+        grand_total_milliunits=grand_total_milliunits,
+        ynab_budget_id=runtime_config.ynab.budget_id,
+        ynab_account_id=config.defaults.ynab_account_id,
+        status=status,
+        message=message,
+        transaction_id=transaction_id,
+        dry_run=dry_run,
+        ynab_action=ynab_action,
+        matched_uncleared_count=matched_uncleared_count,
+        deleted_duplicate_count=deleted_duplicate_count,
+        reused_transaction_id=reused_transaction_id,
     )
+    if log_events is not None:
+        log_events.append(event)
+    else:
+        append_log_event(None if log_to_stdout else runtime_config.app.log_path, event, echo_stdout=dry_run)
 
     return ProcessResult(
         status=status,
@@ -322,9 +483,12 @@ def _process_parsed_receipt(
     )
 
 
-def _validate_totals(receipt: ParsedReceipt, split_lines: list[SplitLine], parent_amount_milliunits: int) -> None:
+def _validate_totals(
+    split_lines: list[SplitLine],
+    expected_grand_total_milliunits: int,
+    parent_amount_milliunits: int,
+) -> None:
     split_total_milliunits = sum(line.total_milliunits for line in split_lines)
-    expected_grand_total_milliunits = dollars_to_milliunits(receipt.grand_total)
 
     if split_total_milliunits != expected_grand_total_milliunits:
         raise ValidationError(
@@ -347,6 +511,7 @@ def _validate_totals(receipt: ParsedReceipt, split_lines: list[SplitLine], paren
 def _build_log_event(
     receipt: ParsedReceipt,
     split_lines: list[SplitLine],
+    grand_total_milliunits: int,
     ynab_budget_id: str,
     ynab_account_id: str,
     status: str,
@@ -359,12 +524,16 @@ def _build_log_event(
     reused_transaction_id: str | None,
 ) -> dict[str, Any]:
     items: list[dict[str, Any]] = []
+    base_total = tax_total = grand_total = 0
     for line in split_lines:
+        base_total += line.base_milliunits
+        tax_total += line.tax_milliunits
+        grand_total += line.total_milliunits
         item: dict[str, Any] = {
             "source_description": line.source_description,
-            "base_amount": str(milliunits_to_dollars(line.base_milliunits)),
-            "tax_amount": str(milliunits_to_dollars(line.tax_milliunits)),
-            "total_amount": str(milliunits_to_dollars(line.total_milliunits)),
+            "base_amount": _format_milliunits(line.base_milliunits),
+            "tax_amount": _format_milliunits(line.tax_milliunits),
+            "total_amount": _format_milliunits(line.total_milliunits),
             "ynab_category_id": line.ynab_category_id,
             "mapping_rule_id": line.mapping_rule_id,
         }
@@ -374,9 +543,6 @@ def _build_log_event(
             item["ynab_payee_name"] = line.ynab_payee_name
         items.append(item)
 
-    base_total = sum(line.base_milliunits for line in split_lines)
-    tax_total = sum(line.tax_milliunits for line in split_lines)
-    grand_total = sum(line.total_milliunits for line in split_lines)
     event: dict[str, Any] = {
         "timestamp": now_local_iso(),
         "event_name": "receipt_processed",
@@ -391,10 +557,10 @@ def _build_log_event(
         },
         "items": items,
         "totals": {
-            "base_amount": str(milliunits_to_dollars(base_total)),
-            "tax_amount": str(milliunits_to_dollars(tax_total)),
-            "grand_total_amount": str(milliunits_to_dollars(grand_total)),
-            "reconciled": grand_total == dollars_to_milliunits(receipt.grand_total),
+            "base_amount": _format_milliunits(base_total),
+            "tax_amount": _format_milliunits(tax_total),
+            "grand_total_amount": _format_milliunits(grand_total),
+            "reconciled": grand_total == grand_total_milliunits,
         },
         "ynab": {
             "budget_id": ynab_budget_id,
@@ -411,23 +577,52 @@ def _build_log_event(
     return event
 
 
+def _format_milliunits(amount: int) -> str:
+    sign = "-" if amount < 0 else ""
+    whole, fraction = divmod(abs(amount), 1000)
+    return f"{sign}{whole}.{fraction:03d}"
+
+
 def _extract_transaction_id(payload: object) -> str | None:
-    data = getattr(payload, "data", None)
-    transaction = getattr(data, "transaction", None)
-    value = getattr(transaction, "id", None)
-    if isinstance(value, str):
-        return value
+    try:
+        value = payload.data.transaction.id  # type: ignore[attr-defined]
+    except AttributeError:
+        try:
+            value = payload["data"]["transaction"]["id"]  # type: ignore[index]
+        except (KeyError, TypeError):
+            return None
+    return value if isinstance(value, str) else None
 
-    if not isinstance(payload, dict):
-        return None
-    data = payload.get("data")
-    if isinstance(data, dict):
-        transaction = data.get("transaction")
-        if isinstance(transaction, dict):
-            value = transaction.get("id")
-            if isinstance(value, str):
-                return value
-    return None
+
+def _load_ynab_module() -> Any:
+    global _ynab_module
+    if _ynab_module is None:
+        try:
+            import ynab
+        except ModuleNotFoundError as exc:
+            raise YnabApiError("The 'ynab' package is required. Install dependencies with `pip install -e .`.") from exc
+        _ynab_module = ynab
+    return _ynab_module
+
+
+def _build_ynab_configuration(ynab_module: Any, ynab_api_url: str, ynab_api_token: str) -> Any:
+    configuration = ynab_module.Configuration(access_token=ynab_api_token)
+    configuration.host = ynab_api_url.rstrip("/")
+    configuration.connection_pool_maxsize = YNAB_CONNECTION_POOL_MAXSIZE
+    return configuration
+
+
+def _get_ynab_api_client(ynab_module: Any, ynab_api_url: str, ynab_api_token: str) -> Any:
+    key = (ynab_api_url, ynab_api_token)
+    with _ynab_api_clients_lock:
+        api_client = _ynab_api_clients.get(key)
+        if api_client is None:
+            api_client = ynab_module.ApiClient(_build_ynab_configuration(ynab_module, ynab_api_url, ynab_api_token))
+            close = getattr(api_client, "close", None)
+            if callable(close):
+                atexit.register(close)
+            _ynab_api_clients[key] = api_client
+    return api_client
 
 
 def _post_ynab_transaction(
@@ -436,16 +631,33 @@ def _post_ynab_transaction(
     ynab_api_url: str,
     transaction: dict[str, Any],
 ) -> str | None:
+    ynab = _load_ynab_module()
+    wrapper = _build_post_transactions_wrapper(ynab, transaction)
+    api_client = _get_ynab_api_client(ynab, ynab_api_url, ynab_api_token)
+    api_exception = getattr(ynab, "ApiException", None)
     try:
-        import ynab
-    except ModuleNotFoundError as exc:
-        raise YnabApiError("The 'ynab' package is required. Install dependencies with `pip install -e .`.") from exc
+        response = _run_ynab_api_call_with_retries(
+            operation_name="create_transaction",
+            call=lambda: _create_ynab_transaction_request(
+                ynab_module=ynab,
+                api_client=api_client,
+                ynab_budget_id=ynab_budget_id,
+                wrapper=wrapper,
+            ),
+            api_exception=api_exception,
+        )
+    except Exception as exc:
+        raise _build_ynab_api_error("create_transaction", exc, api_exception) from exc
+
+    return _extract_transaction_id(response)
+
 
+def _build_post_transactions_wrapper(ynab_module: Any, transaction: dict[str, Any]) -> Any:
     subtransactions_raw = transaction.get("subtransactions")
     subtransactions = None
     if isinstance(subtransactions_raw, list):
         subtransactions = [
-            ynab.SaveSubTransaction(
+            ynab_module.SaveSubTransaction(
                 amount=int(item["amount"]),
                 payee_id=item.get("payee_id"),
                 payee_name=item.get("payee_name"),
@@ -458,26 +670,7 @@ def _post_ynab_transaction(
     parent_payload = {key: value for key, value in transaction.items() if key != "subtransactions"}
     if subtransactions is not None:
         parent_payload["subtransactions"] = subtransactions
-    wrapper = ynab.PostTransactionsWrapper(transaction=ynab.NewTransaction(**parent_payload))
-
-    configuration = ynab.Configuration(access_token=ynab_api_token)
-    configuration.host = ynab_api_url.rstrip("/")
-    api_exception = getattr(ynab, "ApiException", None)
-    try:
-        response = _run_ynab_api_call_with_retries(
-            operation_name="create_transaction",
-            call=lambda: _create_ynab_transaction_request(
-                ynab_module=ynab,
-                configuration=configuration,
-                ynab_budget_id=ynab_budget_id,
-                wrapper=wrapper,
-            ),
-            api_exception=api_exception,
-        )
-    except Exception as exc:
-        raise _build_ynab_api_error("create_transaction", exc, api_exception) from exc
-
-    return _extract_transaction_id(response)
+    return ynab_module.PostTransactionsWrapper(transaction=ynab_module.NewTransaction(**parent_payload))
 
 
 def _update_ynab_transaction(
@@ -488,26 +681,22 @@ def _update_ynab_transaction(
     receipt_date: date,
     receipt_id: str,
 ) -> str | None:
-    try:
-        import ynab
-    except ModuleNotFoundError as exc:
-        raise YnabApiError("The 'ynab' package is required. Install dependencies with `pip install -e .`.") from exc
+    ynab = _load_ynab_module()
 
     wrapper = ynab.PutTransactionWrapper(
         transaction=ynab.ExistingTransaction(
             date=receipt_date,
-            memo=f"Receipt: {receipt_id}",
+            memo=build_receipt_memo(receipt_id),
         )
     )
-    configuration = ynab.Configuration(access_token=ynab_api_token)
-    configuration.host = ynab_api_url.rstrip("/")
+    api_client = _get_ynab_api_client(ynab, ynab_api_url, ynab_api_token)
     api_exception = getattr(ynab, "ApiException", None)
     try:
         response = _run_ynab_api_call_with_retries(
             operation_name="update_transaction",
             call=lambda: _update_ynab_transaction_request(
                 ynab_module=ynab,
-                configuration=configuration,
+                api_client=api_client,
                 ynab_budget_id=ynab_budget_id,
                 transaction_id=transaction_id,
                 wrapper=wrapper,
@@ -525,20 +714,16 @@ def _delete_ynab_transaction(
     ynab_api_url: str,
     transaction_id: str,
 ) -> str | None:
-    try:
-        import ynab
-    except ModuleNotFoundError as exc:
-        raise YnabApiError("The 'ynab' package is required. Install dependencies with `pip install -e .`.") from exc
+    ynab = _load_ynab_module()
 
-    configuration = ynab.Configuration(access_token=ynab_api_token)
-    configuration.host = ynab_api_url.rstrip("/")
+    api_client = _get_ynab_api_client(ynab, ynab_api_url, ynab_api_token)
     api_exception = getattr(ynab, "ApiException", None)
     try:
         response = _run_ynab_api_call_with_retries(
             operation_name="delete_transaction",
             call=lambda: _delete_ynab_transaction_request(
                 ynab_module=ynab,
-                configuration=configuration,
+                api_client=api_client,
                 ynab_budget_id=ynab_budget_id,
                 transaction_id=transaction_id,
             ),
@@ -549,9 +734,37 @@ def _delete_ynab_transaction(
     return _extract_transaction_id(response)
 
 
+def _delete_ynab_transactions(runtime_config: RuntimeConfig, transaction_ids: list[str]) -> None:
+    with ThreadPoolExecutor(max_workers=YNAB_DELETE_MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                _delete_ynab_transaction,
+                ynab_budget_id=runtime_config.ynab.budget_id,
+                ynab_api_token=runtime_config.ynab.api_token,
+                ynab_api_url=runtime_config.ynab.api_url,
+                transaction_id=transaction_id,
+            )
+            for transaction_id in transaction_ids
+        ]
+    errors = [error for error in (future.exception() for future in futures) if error is not None]
+    if not errors:
+        return
+    for error in errors:
+        if not isinstance(error, YnabApiError):
+            raise error
+    if len(errors) == 1:
+        raise errors[0]
+    details = "; ".join(str(error) for error in errors)
+    raise YnabApiError(
+        f"{len(errors)} of {len(transaction_ids)} matched duplicate deletions failed: {details}"
+    ) from errors[0]
+
+
 def _load_existing_uncleared_transaction_candidates(
     runtime_config: RuntimeConfig,
     account_id: str,
+    log_to_stdout: bool,
+    dry_run: bool,
 ) -> list[YnabTransactionCandidate]:
     since_date = date.today() - timedelta(days=runtime_config.ynab.lookback_days)
     transactions = _list_ynab_transactions_by_account(
@@ -560,6 +773,8 @@ def _load_existing_uncleared_transaction_candidates(
         ynab_api_url=runtime_config.ynab.api_url,
         account_id=account_id,
         since_date=since_date,
+        cache_path=_transaction_cache_path(runtime_config, log_to_stdout),
+        update_cache=not dry_run,
     )
     candidates: list[YnabTransactionCandidate] = []
     for item in transactions:
@@ -567,6 +782,7 @@ def _load_existing_uncleared_transaction_candidates(
         if candidate is None:
             continue
         candidates.append(candidate)
+    candidates.sort(key=lambda item: (item.date_value, item.transaction_id))
     return candidates
 
 
@@ -576,30 +792,54 @@ def _list_ynab_transactions_by_account(
     ynab_api_url: str,
     account_id: str,
     since_date: date,
+    cache_path: Path | None = None,
+    update_cache: bool = True,
 ) -> list[Any]:
-    try:
-        import ynab
-    except ModuleNotFoundError as exc:
-        raise YnabApiError("The 'ynab' package is required. Install dependencies with `pip install -e .`.") from exc
+    ynab = _load_ynab_module()
+    cache = _read_transaction_cache(cache_path, ynab_budget_id, account_id, since_date)
+    last_knowledge_of_server = cache["server_knowledge"] if cache is not None else None
 
-    configuration = ynab.Configuration(access_token=ynab_api_token)
-    configuration.host = ynab_api_url.rstrip("/")
+    api_client = _get_ynab_api_client(ynab, ynab_api_url, ynab_api_token)
     api_exception = getattr(ynab, "ApiException", None)
     try:
         response = _run_ynab_api_call_with_retries(
             operation_name="list_transactions",
             call=lambda: _list_ynab_transactions_request(
                 ynab_module=ynab,
-                configuration=configuration,
+                api_client=api_client,
                 ynab_budget_id=ynab_budget_id,
                 account_id=account_id,
                 since_date=since_date,
+                last_knowledge_of_server=last_knowledge_of_server,
             ),
             api_exception=api_exception,
         )
     except Exception as exc:
         raise _build_ynab_api_error("list_transactions", exc, api_exception) from exc
 
+    transactions = _extract_response_transactions(response)
+    if cache_path is None:
+        return transactions
+
+    cached_transactions = cache["transactions"] if cache is not None else {}
+    merged = _merge_transaction_delta(cached_transactions, transactions, since_date)
+    server_knowledge = _extract_server_knowledge(response)
+    if update_cache and server_knowledge is not None:
+        _write_transaction_cache(
+            cache_path,
+            {
+                "version": YNAB_TRANSACTION_CACHE_VERSION,
+                "budget_id": ynab_budget_id,
+                "account_id": account_id,
+                "since_date": since_date.isoformat(),
+                "server_knowledge": server_knowledge,
+                "transactions": merged,
+            },
+        )
+    return list(merged.values())
+
+
+def _extract_response_transactions(response: Any) -> list[Any]:
     data = getattr(response, "data", None)
     transactions = getattr(data, "transactions", None)
     if isinstance(transactions, list):
@@ -614,6 +854,98 @@ def _list_ynab_transactions_by_account(
     return []
 
 
+def _extract_server_knowledge(response: Any) -> int | None:
+    value = getattr(getattr(response, "data", None), "server_knowledge", None)
+    if value is None and isinstance(response, dict):
+        data_dict = response.get("data")
+        if isinstance(data_dict, dict):
+            value = data_dict.get("server_knowledge")
+    if isinstance(value, bool) or not isinstance(value, int):
+        return None
+    return value
+
+
+def _transaction_cache_path(runtime_config: RuntimeConfig, log_to_stdout: bool) -> Path | None:
+    if log_to_stdout or runtime_config.app.log_path is None:
+        return None
+    return runtime_config.app.log_path.with_name(YNAB_TRANSACTION_CACHE_FILENAME)
+
+
+def _read_transaction_cache(
+    cache_path: Path | None,
+    ynab_budget_id: str,
+    account_id: str,
+    since_date: date,
+) -> dict[str, Any] | None:
+    if cache_path is None:
+        return None
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get("version") != YNAB_TRANSACTION_CACHE_VERSION:
+        return None
+    if cache.get("budget_id") != ynab_budget_id or cache.get("account_id") != account_id:
+        return None
+    try:
+        cached_since_date = date.fromisoformat(cache.get("since_date"))
+    except (TypeError, ValueError):
+        return None
+    # A longer lookback window than the cached one needs a full reload.
+    if cached_since_date > since_date:
+        return None
+    server_knowledge = cache.get("server_knowledge")
+    if isinstance(server_knowledge, bool) or not isinstance(server_knowledge, int):
+        return None
+    if not isinstance(cache.get("transactions"), dict):
+        return None
+    return cache
+
+
+def _write_transaction_cache(cache_path: Path, cache: dict[str, Any]) -> None:
+    temp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path.write_text(json.dumps(cache, separators=(",", ":"), sort_keys=True), encoding="utf-8")
+        os.replace(temp_path, cache_path)
+    except OSError:
+        return
+
+
+def _merge_transaction_delta(
+    cached_transactions: dict[str, Any],
+    delta: list[Any],
+    since_date: date,
+) -> dict[str, dict[str, Any]]:
+    merged: dict[str, dict[str, Any]] = {}
+    for item in cached_transactions.values():
+        candidate = _normalize_ynab_transaction_candidate(item)
+        if candidate is not None and candidate.date_value >= since_date:
+            merged[candidate.transaction_id] = _candidate_to_cache_entry(candidate)
+
+    for item in delta:
+        transaction_id = item.get("id") if isinstance(item, dict) else getattr(item, "id", None)
+        if not isinstance(transaction_id, str):
+            continue
+        candidate = _normalize_ynab_transaction_candidate(item)
+        if candidate is None or candidate.date_value < since_date:
+            merged.pop(transaction_id, None)
+            continue
+        merged[transaction_id] = _candidate_to_cache_entry(candidate)
+    return merged
+
+
+def _candidate_to_cache_entry(candidate: YnabTransactionCandidate) -> dict[str, Any]:
+    return {
+        "id": candidate.transaction_id,
+        "date": candidate.date_value.isoformat(),
+        "amount": candidate.amount,
+        "payee_name": candidate.payee_name,
+        "category_id": candidate.category_id,
+        "cleared": candidate.cleared_status,
+    }
+
+
 def _normalize_ynab_transaction_candidate(transaction: Any) -> YnabTransactionCandidate | None:
     if isinstance(transaction, dict):
         transaction_id = transaction.get("id")
@@ -654,8 +986,8 @@ def _normalize_ynab_transaction_candidate(transaction: Any) -> YnabTransactionCa
         transaction_id=transaction_id,
         date_value=normalized_date,
         amount=amount,
-        payee_name=payee_name,
-        category_id=category_id,
+        payee_name=sys.intern(payee_name),
+        category_id=sys.intern(category_id),
         cleared_status=cleared,
     )
 
@@ -667,26 +999,21 @@ def _line_amount_sign(grand_total_milliunits: int) -> int:
 def _plan_uncleared_line_matches(
     split_lines: list[SplitLine],
     grand_total_milliunits: int,
-    candidates: list[YnabTransactionCandidate],
+    sorted_candidates: list[YnabTransactionCandidate],
 ) -> list[PlannedLineMatch]:
     sign = _line_amount_sign(grand_total_milliunits)
-    ordered_candidates = sorted(candidates, key=lambda item: (item.date_value, item.transaction_id))
-    used_ids: set[str] = set()
+    candidates_by_key: dict[tuple[int, str, str], list[YnabTransactionCandidate]] = {}
+    for candidate in sorted_candidates:
+        key = (candidate.amount, candidate.payee_name, candidate.category_id)
+        candidates_by_key.setdefault(key, []).append(candidate)
     planned: list[PlannedLineMatch] = []
     for line_index, line in enumerate(split_lines):
-        signed_amount = sign * abs(line.total_milliunits)
-        for candidate in ordered_candidates:
-            if candidate.transaction_id in used_ids:
-                continue
-            if candidate.amount != signed_amount:
-                continue
-            if candidate.payee_name != line.ynab_payee_name:
-                continue
-            if candidate.category_id != line.ynab_category_id:
-                continue
-            used_ids.add(candidate.transaction_id)
-            planned.append(PlannedLineMatch(line_index=line_index, transaction_id=candidate.transaction_id))
-            break
+        key = (sign * abs(line.total_milliunits), line.ynab_payee_name, line.ynab_category_id)
+        bucket = candidates_by_key.get(key)
+        if not bucket:
+            continue
+        candidate = bucket.pop(0)
+        planned.append(PlannedLineMatch(line_index=line_index, transaction_id=candidate.transaction_id))
     return planned
 
 
@@ -702,66 +1029,64 @@ def _resolve_ynab_flag_color(config: MappingConfig, matched: list[MatchedSubscri
 
 def _create_ynab_transaction_request(
     ynab_module: Any,
-    configuration: Any,
+    api_client: Any,
     ynab_budget_id: str,
     wrapper: Any,
 ) -> Any:
-    with ynab_module.ApiClient(configuration) as api_client:
-        api = ynab_module.TransactionsApi(api_client)
-        return api.create_transaction(
-            ynab_budget_id,
-            wrapper,
-            _request_timeout=YNAB_REQUEST_TIMEOUT_SECONDS,
-        )
+    api = ynab_module.TransactionsApi(api_client)
+    return api.create_transaction(
+        ynab_budget_id,
+        wrapper,
+        _request_timeout=YNAB_REQUEST_TIMEOUT_SECONDS,
+    )
 
 
 def _list_ynab_transactions_request(
     ynab_module: Any,
-    configuration: Any,
+    api_client: Any,
     ynab_budget_id: str,
     account_id: str,
     since_date: date,
+    last_knowledge_of_server: int | None = None,
 ) -> Any:
-    with ynab_module.ApiClient(configuration) as api_client:
-        api = ynab_module.TransactionsApi(api_client)
-        return api.get_transactions_by_account(
-            budget_id=ynab_budget_id,
-            account_id=account_id,
-            since_date=since_date,
-            _request_timeout=YNAB_REQUEST_TIMEOUT_SECONDS,
-        )
+    api = ynab_module.TransactionsApi(api_client)
+    return api.get_transactions_by_account(
+        budget_id=ynab_budget_id,
+        account_id=account_id,
+        since_date=since_date,
+        last_knowledge_of_server=last_knowledge_of_server,
+        _request_timeout=YNAB_REQUEST_TIMEOUT_SECONDS,
+    )
 
 
 def _update_ynab_transaction_request(
     ynab_module: Any,
-    configuration: Any,
+    api_client: Any,
     ynab_budget_id: str,
     transaction_id: str,
     wrapper: Any,
 ) -> Any:
-    with ynab_module.ApiClient(configuration) as api_client:
-        api = ynab_module.TransactionsApi(api_client)
-        return api.update_transaction(
-            budget_id=ynab_budget_id,
-            transaction_id=transaction_id,
-            data=wrapper,
-            _request_timeout=YNAB_REQUEST_TIMEOUT_SECONDS,
-        )
+    api = ynab_module.TransactionsApi(api_client)
+    return api.update_transaction(
+        budget_id=ynab_budget_id,
+        transaction_id=transaction_id,
+        data=wrapper,
+        _request_timeout=YNAB_REQUEST_TIMEOUT_SECONDS,
+    )
 
 
 def _delete_ynab_transaction_request(
     ynab_module: Any,
-    configuration: Any,
+    api_client: Any,
     ynab_budget_id: str,
     transaction_id: str,
 ) -> Any:
-    with ynab_module.ApiClient(configuration) as api_client:
-        api = ynab_module.TransactionsApi(api_client)
-        return api.delete_transaction(
-            budget_id=ynab_budget_id,
-            transaction_id=transaction_id,
-            _request_timeout=YNAB_REQUEST_TIMEOUT_SECONDS,
-        )
+    api = ynab_module.TransactionsApi(api_client)
+    return api.delete_transaction(
+        budget_id=ynab_budget_id,
+        transaction_id=transaction_id,
+        _request_timeout=YNAB_REQUEST_TIMEOUT_SECONDS,
+    )
 
 
 def _run_ynab_api_call_with_retries(
@@ -769,16 +1094,58 @@ def _run_ynab_api_call_with_retries(
     call: Any,
     api_exception: type[BaseException] | None,
 ) -> Any:
-    for attempt in range(YNAB_MAX_RETRIES + 1):
+    for attempt in range(max(YNAB_MAX_RETRIES, YNAB_MAX_RATE_LIMIT_RETRIES) + 1):
         try:
             return call()
         except Exception as exc:
-            if not _is_retryable_ynab_exception(exc, api_exception) or attempt >= YNAB_MAX_RETRIES:
+            if not _is_retryable_ynab_exception(exc, api_exception) or attempt >= _ynab_max_retries(exc):
+                raise
+            delay = _ynab_retry_delay_seconds(attempt, exc)
+            if delay is None:
                 raise
-            time.sleep(0.25 * (2**attempt))
+            time.sleep(delay)
     raise RuntimeError(f"Unexpected retry loop exit for {operation_name}.")
 
 
+def _ynab_max_retries(exc: Exception) -> int:
+    retry_after = _retry_after_seconds(exc)
+    if retry_after is not None and retry_after <= YNAB_RETRY_MAX_DELAY_SECONDS:
+        return YNAB_MAX_RATE_LIMIT_RETRIES
+    return YNAB_MAX_RETRIES
+
+
+def _ynab_retry_delay_seconds(attempt: int, exc: Exception) -> float | None:
+    delay = YNAB_RETRY_BASE_DELAY_SECONDS * (2**attempt) * (0.5 + random.random())
+    retry_after = _retry_after_seconds(exc)
+    if retry_after is not None:
+        if retry_after > YNAB_RETRY_MAX_DELAY_SECONDS:
+            return None
+        delay = max(delay, retry_after)
+    return min(delay, YNAB_RETRY_MAX_DELAY_SECONDS)
+
+
+def _retry_after_seconds(exc: Exception) -> float | None:
+    if getattr(exc, "status", None) != 429:
+        return None
+    headers = getattr(exc, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
 def _is_retryable_ynab_exception(
     exc: Exception,
     api_exception: type[BaseException] | None,
@@ -795,22 +1162,7 @@ def _is_retryable_ynab_exception(
 
 
 def _is_connectivity_exception(exc: object) -> bool:
-    if isinstance(exc, (TimeoutError, ConnectionError, socket.timeout)):
-        return True
-    try:
-        from urllib3 import exceptions as urllib3_exceptions  # type: ignore
-    except Exception:
-        return False
-    return isinstance(
-        exc,
-        (
-            urllib3_exceptions.ConnectTimeoutError,
-            urllib3_exceptions.MaxRetryError,
-            urllib3_exceptions.NewConnectionError,
-            urllib3_exceptions.ProtocolError,
-            urllib3_exceptions.ReadTimeoutError,
-        ),
-    )
+    return isinstance(exc, _CONNECTIVITY_EXCEPTION_TYPES)
 
 
 def _build_ynab_api_error(
@@ -818,36 +1170,9 @@ def _build_ynab_api_error(
     exc: Exception,
     api_exception: type[BaseException] | None,
 ) -> YnabApiError:
-    if operation_name == "create_transaction":
-        connectivity_message = (
-            "Could not connect to the YNAB API while creating the transaction. "
-            "We could not confirm whether YNAB saved the transaction. "
-            "Please check YNAB before retrying."
-        )
-        api_failure_suffix = "No transaction was created."
-        generic_failure_prefix = "Could not create the YNAB transaction"
-    elif operation_name == "update_transaction":
-        connectivity_message = (
-            "Could not connect to the YNAB API while updating the existing transaction. "
-            "No new transaction was created."
-        )
-        api_failure_suffix = "No new transaction was created."
-        generic_failure_prefix = "Could not update the existing YNAB transaction"
-    elif operation_name == "delete_transaction":
-        connectivity_message = (
-            "Could not connect to the YNAB API while deleting matched duplicate transactions. "
-            "The new split transaction may already exist and some duplicate uncleared transactions may remain."
-        )
-        api_failure_suffix = (
-            "The new split transaction may already exist and some duplicate uncleared transactions may remain."
-        )
-        generic_failure_prefix = "Could not delete matched duplicate YNAB transactions"
-    else:
-        connectivity_message = (
-            "Could not connect to the YNAB API while loading existing transactions. No actions were taken."
-        )
-        api_failure_suffix = "No actions were taken."
-        generic_failure_prefix = "Could not load transactions from YNAB"
+    connectivity_message, api_failure_suffix, generic_failure_prefix = _YNAB_ERROR_MESSAGES.get(
+        operation_name, _YNAB_ERROR_MESSAGES["list_transactions"]
+    )
 
     if _is_connectivity_exception(exc):
         return YnabApiError(connectivity_message)
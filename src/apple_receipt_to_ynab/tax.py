@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import heapq
 from decimal import Decimal
+from operator import itemgetter
 
 from apple_receipt_to_ynab.models import MatchedSubscription, SplitLine
 from apple_receipt_to_ynab.utils import dollars_to_milliunits
@@ -59,7 +61,8 @@ def allocate_proportional_milliunits(base_amounts: list[int], tax_total: int) ->
         remainders.append((numerator % total_base, idx))
 
     remainder_units = remaining - sum(floor_allocations)
-    for _, idx in sorted(remainders, key=lambda item: item[0], reverse=True)[:remainder_units]:
-        floor_allocations[idx] += 1
+    if remainder_units:
+        for _, idx in heapq.nlargest(remainder_units, remainders, key=itemgetter(0)):
+            floor_allocations[idx] += 1
 
     return [value * sign for value in floor_allocations]
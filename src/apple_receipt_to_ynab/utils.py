@@ -7,6 +7,9 @@ MILLIUNIT_FACTOR = Decimal("1000")
 
 
 def dollars_to_milliunits(amount: Decimal) -> int:
+    exponent = amount.as_tuple().exponent
+    if isinstance(exponent, int) and exponent >= -3:
+        return int(amount.scaleb(3))
     return int((amount * MILLIUNIT_FACTOR).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
 
 
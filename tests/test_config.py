@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import pytest
@@ -13,6 +14,7 @@ from apple_receipt_to_ynab.config import (
     DEFAULT_YNAB_LOOKBACK_DAYS,
     ConfigError,
     load_config,
+    load_config_from_text,
 )
 
 
@@ -368,6 +370,33 @@ mappings:
         load_config(path)
 
 
+def test_load_config_rejects_invalid_rule_regex(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        """
+version: 1
+ynab:
+  api_token: "token"
+  budget_id: "budget"
+mappings:
+  defaults:
+    ynab_account_id: "acct"
+  rules:
+    - id: r1
+      enabled: true
+      match:
+        type: regex
+        value: "Apple (Music"
+      ynab_category_id: "cat"
+      ynab_payee_name: "Apple Music"
+""".strip(),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ConfigError, match="Invalid regex 'Apple \\(Music'"):
+        load_config(path)
+
+
 def test_load_config_rejects_missing_fallback_payee_when_enabled(tmp_path: Path) -> None:
     path = tmp_path / "config.yaml"
     path.write_text(
@@ -428,3 +457,66 @@ mappings:
     assert cfg.mappings.fallback is not None
     assert cfg.mappings.fallback.enabled is False
     assert cfg.mappings.fallback.ynab_payee_name is None
+
+
+def test_load_config_reuses_parsed_config_until_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    template = """
+version: 1
+ynab:
+  api_token: "{token}"
+  budget_id: "budget"
+mappings:
+  defaults:
+    ynab_account_id: "acct"
+  rules:
+    - id: r1
+      enabled: true
+      match:
+        type: exact
+        value: "Apple Music"
+      ynab_category_id: "cat"
+      ynab_payee_name: "Apple Music"
+""".strip()
+    path.write_text(template.format(token="token-1"), encoding="utf-8")
+
+    first = load_config(path)
+    assert load_config(path) is first
+
+    first_mtime_ns = path.stat().st_mtime_ns
+    path.write_text(template.format(token="token-2"), encoding="utf-8")
+    os.utime(path, ns=(first_mtime_ns + 1_000_000_000, first_mtime_ns + 1_000_000_000))
+    second = load_config(path)
+
+    assert second is not first
+    assert second.ynab.api_token == "token-2"
+
+
+def test_load_config_from_text_resolves_relative_paths_against_source_path(tmp_path: Path) -> None:
+    cfg = load_config_from_text(
+        """
+version: 1
+ynab:
+  api_token: "token"
+  budget_id: "budget"
+app:
+  mode: "email"
+email:
+  service_account_key_path: "secrets/gmail-sa.json"
+  delegated_user_email: "robot@example.com"
+mappings:
+  defaults:
+    ynab_account_id: "acct"
+  rules:
+    - id: r1
+      match:
+        type: exact
+        value: "Apple Music"
+      ynab_category_id: "cat"
+      ynab_payee_name: "Apple Music"
+""".strip(),
+        source_path=tmp_path / "config.yaml",
+    )
+
+    assert cfg.app.mode == "email"
+    assert cfg.email.service_account_key_path == tmp_path / "secrets" / "gmail-sa.json"
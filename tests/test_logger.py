@@ -1,7 +1,11 @@
 import json
+from decimal import Decimal
 from pathlib import Path
 
-from apple_receipt_to_ynab.logger import append_log_block, append_log_event
+import pytest
+
+import apple_receipt_to_ynab.logger as logger
+from apple_receipt_to_ynab.logger import append_log_block, append_log_event, append_log_events
 
 
 def test_append_log_event_stdout_pretty_prints_json(capsys) -> None:
@@ -33,3 +37,58 @@ def test_append_log_block_pretty_prints_json_lines_only(capsys) -> None:
     output = capsys.readouterr().out
     assert '  "x"' in output
     assert "plain line" in output
+
+
+def test_append_log_event_file_serializes_decimal_as_string(tmp_path: Path) -> None:
+    log_path = tmp_path / "run.log"
+    append_log_event(path=log_path, event={"amount": Decimal("10.800")}, echo_stdout=False)
+
+    assert log_path.read_text(encoding="utf-8") == '{"amount":"10.800"}\n'
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_append_log_event_file_writes_non_ascii_as_utf8(tmp_path: Path, monkeypatch, use_orjson: bool) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(logger, "orjson", None)
+    log_path = tmp_path / "run.log"
+    append_log_event(path=log_path, event={"name": "Pokémon GO"}, echo_stdout=False)
+
+    assert log_path.read_bytes() == '{"name":"Pokémon GO"}\n'.encode("utf-8")
+
+
+def test_append_log_events_writes_batch_in_order(tmp_path: Path) -> None:
+    log_path = tmp_path / "run.log"
+    append_log_events(path=log_path, events=[{"n": 1}, {"n": 2}], echo_stdout=False)
+
+    assert log_path.read_text(encoding="utf-8") == '{"n":1}\n{"n":2}\n'
+
+
+def test_append_log_block_prints_non_json_line_unchanged(capsys) -> None:
+    append_log_block(path=None, lines=["{not json"], echo_stdout=False)
+
+    assert capsys.readouterr().out.strip() == "{not json"
+
+
+def test_append_log_event_and_block_append_to_same_file(tmp_path: Path) -> None:
+    log_path = tmp_path / "logs" / "run.log"
+    append_log_event(path=log_path, event={"n": 1}, echo_stdout=False)
+    append_log_block(path=log_path, lines=["plain line"], echo_stdout=False)
+
+    assert log_path.read_text(encoding="utf-8") == '{"n":1}\nplain line\n'
+
+
+def test_append_log_event_reopens_rotated_or_deleted_log(tmp_path: Path) -> None:
+    log_path = tmp_path / "run.log"
+    rotated_path = tmp_path / "run.log.1"
+    append_log_event(path=log_path, event={"n": 1}, echo_stdout=False)
+
+    log_path.rename(rotated_path)
+    append_log_event(path=log_path, event={"n": 2}, echo_stdout=False)
+
+    assert rotated_path.read_text(encoding="utf-8") == '{"n":1}\n'
+    assert log_path.read_text(encoding="utf-8") == '{"n":2}\n'
+
+    log_path.unlink()
+    append_log_event(path=log_path, event={"n": 3}, echo_stdout=False)
+
+    assert log_path.read_text(encoding="utf-8") == '{"n":3}\n'
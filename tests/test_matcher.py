@@ -86,3 +86,43 @@ def test_match_raises_unmapped_error_when_no_rule_and_fallback_disabled() -> Non
             [SubscriptionLine(description="Unknown Subscription", base_amount=Decimal("4.99"))],
             config,
         )
+
+
+def test_match_skips_disabled_rules_and_keeps_config_order_within_type() -> None:
+    config = MappingConfig(
+        version=1,
+        defaults=MappingDefaults(ynab_account_id="a1"),
+        rules=[
+            MappingRule(
+                id="disabled_exact",
+                enabled=False,
+                match=MatchSpec(type="exact", value="Apple Music"),
+                ynab_category_id="c0",
+                ynab_payee_name="Disabled",
+            ),
+            MappingRule(
+                id="first_contains",
+                enabled=True,
+                match=MatchSpec(type="contains", value="Music"),
+                ynab_category_id="c1",
+                ynab_payee_name="First",
+            ),
+            MappingRule(
+                id="second_contains",
+                enabled=True,
+                match=MatchSpec(type="contains", value="Apple"),
+                ynab_category_id="c2",
+                ynab_payee_name="Second",
+            ),
+        ],
+        fallback=None,
+    )
+
+    matched = match_subscriptions(
+        [
+            SubscriptionLine(description="Apple Music", base_amount=Decimal("9.99")),
+            SubscriptionLine(description="Apple TV+", base_amount=Decimal("6.99")),
+        ],
+        config,
+    )
+    assert [item.mapping_rule_id for item in matched] == ["first_contains", "second_contains"]
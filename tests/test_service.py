@@ -1,11 +1,14 @@
 import json
+from dataclasses import replace
 from datetime import date
 from decimal import Decimal
 from pathlib import Path
+from types import SimpleNamespace
 
 import apple_receipt_to_ynab.service as service
 import pytest
 from apple_receipt_to_ynab.gmail_client import GmailMessage
+from apple_receipt_to_ynab.matcher import UnmappedSubscriptionError
 from apple_receipt_to_ynab.models import (
     AppConfig,
     EmailConfig,
@@ -19,8 +22,10 @@ from apple_receipt_to_ynab.models import (
     SubscriptionLine,
     YnabConfig,
 )
+from apple_receipt_to_ynab.parser import ReceiptParseError
 from apple_receipt_to_ynab.service import _resolve_ynab_flag_color, process_receipt
-from apple_receipt_to_ynab.ynab import YnabApiError
+from apple_receipt_to_ynab.utils import milliunits_to_dollars
+from apple_receipt_to_ynab.ynab import YnabApiError, build_parent_transaction
 
 
 def _build_runtime_config(log_path: Path | None = None, defaults_flag_color: str | None = None) -> RuntimeConfig:
@@ -103,67 +108,55 @@ def _build_uncleared_candidate(
     }
 
 
-def test_resolve_ynab_flag_color_returns_color_when_fallback_was_used() -> None:
-    config = MappingConfig(
-        version=1,
-        defaults=MappingDefaults(ynab_account_id="acct", ynab_flag_color="blue"),
-        rules=[],
-        fallback=FallbackMapping(enabled=True, ynab_category_id="cat", ynab_flag_color="yellow"),
-    )
-    matched = [
-        MatchedSubscription(
-            source_description="Unknown App",
-            base_amount=Decimal("1.00"),
-            ynab_category_id="cat",
-            ynab_payee_id=None,
-            ynab_payee_name="Apple",
-            mapping_rule_id="fallback",
-        )
-    ]
-
-    assert _resolve_ynab_flag_color(config, matched) == "yellow"
-
-
-def test_resolve_ynab_flag_color_ignores_mapped_only_transactions() -> None:
-    config = MappingConfig(
-        version=1,
-        defaults=MappingDefaults(ynab_account_id="acct", ynab_flag_color="blue"),
-        rules=[],
-        fallback=FallbackMapping(enabled=True, ynab_category_id="cat", ynab_flag_color="yellow"),
-    )
-    matched = [
-        MatchedSubscription(
-            source_description="Apple Music",
-            base_amount=Decimal("1.00"),
-            ynab_category_id="cat",
-            ynab_payee_id=None,
-            ynab_payee_name="Apple Music",
-            mapping_rule_id="apple_music",
-        )
-    ]
-
-    assert _resolve_ynab_flag_color(config, matched) == "blue"
+def _install_receipt_stubs(
+    monkeypatch,
+    runtime_config: RuntimeConfig,
+    parsed: ParsedReceipt,
+    matched: list[MatchedSubscription],
+    split_lines: list[SplitLine],
+    candidates: list[dict[str, object]] | None = None,
+) -> None:
+    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
+    monkeypatch.setattr(service, "parse_receipt_file", lambda _path, default_currency: parsed)
+    monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
+    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
+    monkeypatch.setattr(service, "_list_ynab_transactions_by_account", lambda **_: list(candidates or []))
 
 
-def test_resolve_ynab_flag_color_uses_default_when_fallback_used_without_fallback_color() -> None:
+@pytest.mark.parametrize(
+    ("fallback_flag_color", "description", "payee_name", "rule_id", "expected"),
+    [
+        ("yellow", "Unknown App", "Apple", "fallback", "yellow"),
+        ("yellow", "Apple Music", "Apple Music", "apple_music", "blue"),
+        (None, "Unknown App", "Apple", "fallback", "blue"),
+    ],
+    ids=["fallback_color", "mapped_only", "fallback_without_color"],
+)
+def test_resolve_ynab_flag_color(
+    fallback_flag_color: str | None,
+    description: str,
+    payee_name: str,
+    rule_id: str,
+    expected: str,
+) -> None:
     config = MappingConfig(
         version=1,
         defaults=MappingDefaults(ynab_account_id="acct", ynab_flag_color="blue"),
         rules=[],
-        fallback=FallbackMapping(enabled=True, ynab_category_id="cat"),
+        fallback=FallbackMapping(enabled=True, ynab_category_id="cat", ynab_flag_color=fallback_flag_color),
     )
     matched = [
         MatchedSubscription(
-            source_description="Unknown App",
+            source_description=description,
             base_amount=Decimal("1.00"),
             ynab_category_id="cat",
             ynab_payee_id=None,
-            ynab_payee_name="Apple",
-            mapping_rule_id="fallback",
+            ynab_payee_name=payee_name,
+            mapping_rule_id=rule_id,
         )
     ]
 
-    assert _resolve_ynab_flag_color(config, matched) == "blue"
+    assert _resolve_ynab_flag_color(config, matched) == expected
 
 
 def test_process_receipt_posts_once_when_not_dry_run(tmp_path: Path, monkeypatch) -> None:
@@ -173,11 +166,7 @@ def test_process_receipt_posts_once_when_not_dry_run(tmp_path: Path, monkeypatch
     runtime_config = _build_runtime_config(log_path=tmp_path / "run.log")
     post_calls: list[dict[str, object]] = []
 
-    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
-    monkeypatch.setattr(service, "parse_receipt_file", lambda _path, default_currency: parsed)
-    monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
-    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
-    monkeypatch.setattr(service, "_list_ynab_transactions_by_account", lambda **_: [])
+    _install_receipt_stubs(monkeypatch, runtime_config, parsed, matched, split_lines)
 
     def _fake_post(
         ynab_budget_id: str,
@@ -220,11 +209,7 @@ def test_process_receipt_409_raises_ynab_api_error(tmp_path: Path, monkeypatch)
     runtime_config = _build_runtime_config(log_path=tmp_path / "run.log")
     call_count = {"value": 0}
 
-    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
-    monkeypatch.setattr(service, "parse_receipt_file", lambda _path, default_currency: parsed)
-    monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
-    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
-    monkeypatch.setattr(service, "_list_ynab_transactions_by_account", lambda **_: [])
+    _install_receipt_stubs(monkeypatch, runtime_config, parsed, matched, split_lines)
 
     def _raise_409(
         ynab_budget_id: str,
@@ -256,11 +241,7 @@ def test_process_receipt_dry_run_logs_to_stdout_when_log_path_missing(
     split_lines = _build_split_lines()
     runtime_config = _build_runtime_config(log_path=None)
 
-    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
-    monkeypatch.setattr(service, "parse_receipt_file", lambda _path, default_currency: parsed)
-    monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
-    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
-    monkeypatch.setattr(service, "_list_ynab_transactions_by_account", lambda **_: [])
+    _install_receipt_stubs(monkeypatch, runtime_config, parsed, matched, split_lines)
 
     result = process_receipt(
         receipt_path=tmp_path / "receipt.eml",
@@ -286,11 +267,7 @@ def test_process_receipt_dry_run_writes_file_and_echoes_to_stdout(
     log_path = tmp_path / "run.log"
     runtime_config = _build_runtime_config(log_path=log_path)
 
-    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
-    monkeypatch.setattr(service, "parse_receipt_file", lambda _path, default_currency: parsed)
-    monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
-    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
-    monkeypatch.setattr(service, "_list_ynab_transactions_by_account", lambda **_: [])
+    _install_receipt_stubs(monkeypatch, runtime_config, parsed, matched, split_lines)
 
     process_receipt(
         receipt_path=tmp_path / "receipt.eml",
@@ -316,11 +293,7 @@ def test_process_receipt_stdout_flag_prints_logs_without_writing_file(
     log_path = tmp_path / "run.log"
     runtime_config = _build_runtime_config(log_path=log_path)
 
-    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
-    monkeypatch.setattr(service, "parse_receipt_file", lambda _path, default_currency: parsed)
-    monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
-    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
-    monkeypatch.setattr(service, "_list_ynab_transactions_by_account", lambda **_: [])
+    _install_receipt_stubs(monkeypatch, runtime_config, parsed, matched, split_lines)
 
     result = process_receipt(
         receipt_path=tmp_path / "receipt.eml",
@@ -341,14 +314,13 @@ def test_process_receipt_reuses_matching_uncleared_transaction(tmp_path: Path, m
     split_lines = _build_split_lines()
     runtime_config = _build_runtime_config(log_path=tmp_path / "run.log")
 
-    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
-    monkeypatch.setattr(service, "parse_receipt_file", lambda _path, default_currency: parsed)
-    monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
-    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
-    monkeypatch.setattr(
-        service,
-        "_list_ynab_transactions_by_account",
-        lambda **_: [_build_uncleared_candidate("existing-tx-1", "2026-02-16", -10800)],
+    _install_receipt_stubs(
+        monkeypatch,
+        runtime_config,
+        parsed,
+        matched,
+        split_lines,
+        candidates=[_build_uncleared_candidate("existing-tx-1", "2026-02-16", -10800)],
     )
     monkeypatch.setattr(service, "append_log_event", lambda *_args, **_kwargs: None)
 
@@ -385,14 +357,13 @@ def test_process_receipt_reuses_oldest_matching_uncleared_transaction(tmp_path:
     runtime_config = _build_runtime_config(log_path=tmp_path / "run.log")
     updated_ids: list[str] = []
 
-    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
-    monkeypatch.setattr(service, "parse_receipt_file", lambda _path, default_currency: parsed)
-    monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
-    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
-    monkeypatch.setattr(
-        service,
-        "_list_ynab_transactions_by_account",
-        lambda **_: [
+    _install_receipt_stubs(
+        monkeypatch,
+        runtime_config,
+        parsed,
+        matched,
+        split_lines,
+        candidates=[
             _build_uncleared_candidate("tx-newer", "2026-02-16", -10800),
             _build_uncleared_candidate("tx-older", "2026-02-01", -10800),
         ],
@@ -469,14 +440,13 @@ def test_process_receipt_multi_creates_then_deletes_matching_uncleared(tmp_path:
     runtime_config = _build_runtime_config(log_path=tmp_path / "run.log")
     call_order: list[str] = []
 
-    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
-    monkeypatch.setattr(service, "parse_receipt_file", lambda _path, default_currency: parsed)
-    monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
-    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
-    monkeypatch.setattr(
-        service,
-        "_list_ynab_transactions_by_account",
-        lambda **_: [
+    _install_receipt_stubs(
+        monkeypatch,
+        runtime_config,
+        parsed,
+        matched,
+        split_lines,
+        candidates=[
             _build_uncleared_candidate("dup-a", "2026-02-01", -5000, payee_name="Payee A", category_id="cat-1"),
             _build_uncleared_candidate("dup-b", "2026-02-02", -5800, payee_name="Payee B", category_id="cat-2"),
         ],
@@ -514,10 +484,7 @@ def test_process_receipt_dry_run_queries_for_preview_without_writes(tmp_path: Pa
     runtime_config = _build_runtime_config(log_path=None)
     calls = {"list": 0, "post": 0, "update": 0, "delete": 0}
 
-    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
-    monkeypatch.setattr(service, "parse_receipt_file", lambda _path, default_currency: parsed)
-    monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
-    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
+    _install_receipt_stubs(monkeypatch, runtime_config, parsed, matched, split_lines)
     monkeypatch.setattr(
         service,
         "_list_ynab_transactions_by_account",
@@ -597,14 +564,13 @@ def test_process_receipt_delete_failure_reports_partial_cleanup_risk(tmp_path: P
     ]
     runtime_config = _build_runtime_config(log_path=tmp_path / "run.log")
 
-    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
-    monkeypatch.setattr(service, "parse_receipt_file", lambda _path, default_currency: parsed)
-    monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
-    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
-    monkeypatch.setattr(
-        service,
-        "_list_ynab_transactions_by_account",
-        lambda **_: [_build_uncleared_candidate("dup-a", "2026-02-01", -5000, payee_name="Payee A", category_id="cat-1")],
+    _install_receipt_stubs(
+        monkeypatch,
+        runtime_config,
+        parsed,
+        matched,
+        split_lines,
+        candidates=[_build_uncleared_candidate("dup-a", "2026-02-01", -5000, payee_name="Payee A", category_id="cat-1")],
     )
     monkeypatch.setattr(service, "_post_ynab_transaction", lambda **_: "tx-new-parent")
     monkeypatch.setattr(service, "append_log_event", lambda *_args, **_kwargs: None)
@@ -622,27 +588,26 @@ def test_process_receipt_delete_failure_reports_partial_cleanup_risk(tmp_path: P
         )
 
 
-def test_process_receipt_gmail_mode_processes_batch(tmp_path: Path, monkeypatch) -> None:
+@pytest.mark.parametrize("message_count", [1, 2, 5])
+def test_process_receipt_gmail_mode_processes_batch(tmp_path: Path, monkeypatch, message_count: int) -> None:
     parsed = _build_parsed_receipt(tmp_path)
     matched = _build_matched()
     split_lines = _build_split_lines()
     runtime_config = _build_runtime_config(log_path=tmp_path / "run.log")
-    runtime_config = RuntimeConfig(
-        version=runtime_config.version,
-        ynab=runtime_config.ynab,
+    runtime_config = replace(
+        runtime_config,
         app=AppConfig(mode="email", log_path=runtime_config.app.log_path),
         email=EmailConfig(
             service_account_key_path=tmp_path / "gmail-sa.json",
             delegated_user_email="robot@example.com",
         ),
-        mappings=runtime_config.mappings,
     )
 
     monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
     monkeypatch.setattr(
         service,
         "fetch_gmail_messages",
-        lambda _cfg: [GmailMessage(message_id="mid-1", raw_bytes=b"raw"), GmailMessage(message_id="mid-2", raw_bytes=b"raw2")],
+        lambda _cfg: [GmailMessage(message_id=f"mid-{index}", raw_bytes=b"raw") for index in range(message_count)],
     )
     monkeypatch.setattr(service, "_parse_gmail_message", lambda _msg, default_currency: parsed)
     monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
@@ -665,7 +630,513 @@ def test_process_receipt_gmail_mode_processes_batch(tmp_path: Path, monkeypatch)
     )
 
     assert result.receipt_id == "GMAIL-BATCH"
-    assert result.processed_count == 2
-    assert result.created_count == 2
+    assert result.processed_count == message_count
+    assert result.created_count == message_count
     assert result.duplicate_count == 0
-    assert post_calls["value"] == 2
+    assert post_calls["value"] == message_count
+
+
+@pytest.mark.parametrize("amount", [0, 5, 800, 10800, -10800, -5, 1234567])
+def test_format_milliunits_matches_decimal_conversion(amount: int) -> None:
+    assert service._format_milliunits(amount) == str(milliunits_to_dollars(amount))
+
+
+def test_extract_transaction_id_reads_sdk_objects_and_dicts() -> None:
+    class _Node:
+        def __init__(self, **kwargs: object) -> None:
+            self.__dict__.update(kwargs)
+
+    sdk_response = _Node(data=_Node(transaction=_Node(id="tx-sdk")))
+
+    assert service._extract_transaction_id(sdk_response) == "tx-sdk"
+    assert service._extract_transaction_id({"data": {"transaction": {"id": "tx-dict"}}}) == "tx-dict"
+    assert service._extract_transaction_id({"data": {"transaction": None}}) is None
+    assert service._extract_transaction_id(_Node(data=None)) is None
+    assert service._extract_transaction_id(None) is None
+
+
+class _FakeApiException(Exception):
+    def __init__(self, status: int, headers: dict[str, str] | None = None) -> None:
+        super().__init__(f"status {status}")
+        self.status = status
+        self.headers = headers
+
+
+def test_run_ynab_api_call_with_retries_honors_retry_after(monkeypatch) -> None:
+    sleeps: list[float] = []
+    attempts = {"value": 0}
+
+    def _call() -> str:
+        attempts["value"] += 1
+        if attempts["value"] == 1:
+            raise _FakeApiException(429, headers={"Retry-After": "3"})
+        return "ok"
+
+    monkeypatch.setattr(service.time, "sleep", sleeps.append)
+    monkeypatch.setattr(service.random, "random", lambda: 0.0)
+
+    result = service._run_ynab_api_call_with_retries("create_transaction", _call, _FakeApiException)
+
+    assert result == "ok"
+    assert sleeps == [3.0]
+
+
+@pytest.mark.parametrize(
+    ("status", "headers", "expected_attempts"),
+    [
+        (429, {"Retry-After": "1"}, service.YNAB_MAX_RATE_LIMIT_RETRIES + 1),
+        (429, None, service.YNAB_MAX_RETRIES + 1),
+        (503, None, service.YNAB_MAX_RETRIES + 1),
+    ],
+)
+def test_run_ynab_api_call_with_retries_allows_more_attempts_when_rate_limited(
+    monkeypatch, status: int, headers: dict[str, str] | None, expected_attempts: int
+) -> None:
+    attempts = {"value": 0}
+
+    def _call() -> str:
+        attempts["value"] += 1
+        raise _FakeApiException(status, headers=headers)
+
+    monkeypatch.setattr(service.time, "sleep", lambda _seconds: None)
+
+    with pytest.raises(_FakeApiException):
+        service._run_ynab_api_call_with_retries("create_transaction", _call, _FakeApiException)
+
+    assert attempts["value"] == expected_attempts
+
+
+def test_ynab_retry_delay_is_jittered_and_capped(monkeypatch) -> None:
+    monkeypatch.setattr(service.random, "random", lambda: 0.5)
+    assert service._ynab_retry_delay_seconds(1, _FakeApiException(503)) == 0.5
+    assert service._ynab_retry_delay_seconds(10, _FakeApiException(503)) == service.YNAB_RETRY_MAX_DELAY_SECONDS
+
+    too_long = _FakeApiException(429, headers={"Retry-After": "120"})
+    assert service._ynab_retry_delay_seconds(0, too_long) is None
+
+
+def test_run_ynab_api_call_with_retries_raises_when_retry_after_exceeds_cap(monkeypatch) -> None:
+    sleeps: list[float] = []
+    attempts = {"value": 0}
+
+    def _call() -> str:
+        attempts["value"] += 1
+        raise _FakeApiException(429, headers={"Retry-After": "3600"})
+
+    monkeypatch.setattr(service.time, "sleep", sleeps.append)
+
+    with pytest.raises(_FakeApiException):
+        service._run_ynab_api_call_with_retries("create_transaction", _call, _FakeApiException)
+
+    assert attempts["value"] == 1
+    assert sleeps == []
+
+
+def test_list_ynab_transactions_by_account_merges_server_knowledge_delta(tmp_path: Path, monkeypatch) -> None:
+    cache_path = tmp_path / "ynab-transactions-cache.json"
+    since_date = date(2026, 2, 10)
+    requests: list[int | None] = []
+    responses = [
+        {
+            "data": {
+                "server_knowledge": 10,
+                "transactions": [
+                    _build_uncleared_candidate("tx-keep", "2026-02-11", -1000),
+                    _build_uncleared_candidate("tx-cleared-later", "2026-02-12", -2000),
+                    _build_uncleared_candidate("tx-deleted-later", "2026-02-13", -3000),
+                ],
+            }
+        },
+        {
+            "data": {
+                "server_knowledge": 12,
+                "transactions": [
+                    {**_build_uncleared_candidate("tx-cleared-later", "2026-02-12", -2000), "cleared": "cleared"},
+                    {**_build_uncleared_candidate("tx-deleted-later", "2026-02-13", -3000), "deleted": True},
+                    _build_uncleared_candidate("tx-new", "2026-02-14", -4000),
+                ],
+            }
+        },
+    ]
+
+    def _fake_request(**kwargs: object) -> object:
+        requests.append(kwargs["last_knowledge_of_server"])  # type: ignore[arg-type]
+        return responses[len(requests) - 1]
+
+    fake_ynab = SimpleNamespace(
+        Configuration=lambda access_token: SimpleNamespace(),
+        ApiClient=lambda configuration: SimpleNamespace(),
+        ApiException=None,
+    )
+    monkeypatch.setattr(service, "_load_ynab_module", lambda: fake_ynab)
+    monkeypatch.setattr(service, "_ynab_api_clients", {})
+    monkeypatch.setattr(service, "_list_ynab_transactions_request", _fake_request)
+    list_kwargs = {
+        "ynab_budget_id": "budget-1",
+        "ynab_api_token": "token-1",
+        "ynab_api_url": "https://ynab.test/v1",
+        "account_id": "acct-1",
+        "since_date": since_date,
+        "cache_path": cache_path,
+    }
+
+    first = service._list_ynab_transactions_by_account(**list_kwargs)
+    second = service._list_ynab_transactions_by_account(**list_kwargs)
+
+    assert requests == [None, 10]
+    assert {item["id"] for item in first} == {"tx-keep", "tx-cleared-later", "tx-deleted-later"}
+    assert {item["id"] for item in second} == {"tx-keep", "tx-new"}
+    assert json.loads(cache_path.read_text(encoding="utf-8"))["server_knowledge"] == 12
+
+
+def test_process_receipt_stdout_flag_skips_transaction_cache(tmp_path: Path, monkeypatch) -> None:
+    parsed = _build_parsed_receipt(tmp_path)
+    log_dir = tmp_path / "logs"
+    runtime_config = _build_runtime_config(log_path=log_dir / "run.log")
+    requests: list[object] = []
+
+    def _fake_request(**kwargs: object) -> object:
+        requests.append(kwargs["last_knowledge_of_server"])
+        return {"data": {"server_knowledge": 10, "transactions": []}}
+
+    fake_ynab = SimpleNamespace(
+        Configuration=lambda access_token: SimpleNamespace(),
+        ApiClient=lambda configuration: SimpleNamespace(),
+        ApiException=None,
+    )
+    list_transactions = service._list_ynab_transactions_by_account
+    _install_receipt_stubs(monkeypatch, runtime_config, parsed, _build_matched(), _build_split_lines())
+    monkeypatch.setattr(service, "_list_ynab_transactions_by_account", list_transactions)
+    monkeypatch.setattr(service, "_load_ynab_module", lambda: fake_ynab)
+    monkeypatch.setattr(service, "_ynab_api_clients", {})
+    monkeypatch.setattr(service, "_list_ynab_transactions_request", _fake_request)
+    monkeypatch.setattr(service, "_post_ynab_transaction", lambda **_: "tx-1")
+    monkeypatch.setattr(service, "append_log_event", lambda *_args, **_kwargs: None)
+
+    result = process_receipt(
+        receipt_path=tmp_path / "receipt.eml",
+        config_path=tmp_path / "config.yaml",
+        dry_run=False,
+        log_to_stdout=True,
+    )
+
+    assert result.status == "created"
+    assert requests == [None]
+    assert not log_dir.exists()
+
+
+def test_process_receipt_dry_run_reads_but_does_not_write_transaction_cache(tmp_path: Path, monkeypatch) -> None:
+    parsed = _build_parsed_receipt(tmp_path)
+    log_dir = tmp_path / "logs"
+    runtime_config = _build_runtime_config(log_path=log_dir / "run.log")
+    requests: list[object] = []
+
+    def _fake_request(**kwargs: object) -> object:
+        requests.append(kwargs["last_knowledge_of_server"])
+        return {"data": {"server_knowledge": 10, "transactions": []}}
+
+    fake_ynab = SimpleNamespace(
+        Configuration=lambda access_token: SimpleNamespace(),
+        ApiClient=lambda configuration: SimpleNamespace(),
+        ApiException=None,
+    )
+    list_transactions = service._list_ynab_transactions_by_account
+    _install_receipt_stubs(monkeypatch, runtime_config, parsed, _build_matched(), _build_split_lines())
+    monkeypatch.setattr(service, "_list_ynab_transactions_by_account", list_transactions)
+    monkeypatch.setattr(service, "_load_ynab_module", lambda: fake_ynab)
+    monkeypatch.setattr(service, "_ynab_api_clients", {})
+    monkeypatch.setattr(service, "_list_ynab_transactions_request", _fake_request)
+    monkeypatch.setattr(service, "append_log_event", lambda *_args, **_kwargs: None)
+
+    result = process_receipt(
+        receipt_path=tmp_path / "receipt.eml",
+        config_path=tmp_path / "config.yaml",
+        dry_run=True,
+    )
+
+    assert result.status == "DRY_RUN"
+    assert requests == [None]
+    assert not (log_dir / service.YNAB_TRANSACTION_CACHE_FILENAME).exists()
+
+
+def test_process_receipt_gmail_mode_noop_skips_ynab_load(tmp_path: Path, monkeypatch) -> None:
+    runtime_config = _build_runtime_config(log_path=tmp_path / "run.log")
+    runtime_config = replace(
+        runtime_config,
+        app=AppConfig(mode="email", log_path=runtime_config.app.log_path),
+        email=EmailConfig(
+            service_account_key_path=tmp_path / "gmail-sa.json",
+            delegated_user_email="robot@example.com",
+        ),
+    )
+
+    list_calls = {"value": 0}
+
+    def _raise_list(**_: object) -> list[object]:
+        list_calls["value"] += 1
+        raise YnabApiError("Could not load transactions from YNAB")
+
+    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
+    monkeypatch.setattr(service, "fetch_gmail_messages", lambda _cfg: [])
+    monkeypatch.setattr(service, "_list_ynab_transactions_by_account", _raise_list)
+    monkeypatch.setattr(service, "append_log_event", lambda *_args, **_kwargs: None)
+
+    result = process_receipt(receipt_path=None, config_path=tmp_path / "config.yaml", dry_run=False)
+
+    assert result.status == "noop"
+    assert list_calls["value"] == 0
+
+
+def test_process_receipt_gmail_mode_logs_receipts_in_message_order(tmp_path: Path, monkeypatch) -> None:
+    matched = _build_matched()
+    split_lines = _build_split_lines()
+    log_path = tmp_path / "run.log"
+    runtime_config = _build_runtime_config(log_path=log_path)
+    runtime_config = replace(
+        runtime_config,
+        app=AppConfig(mode="email", log_path=log_path),
+        email=EmailConfig(
+            service_account_key_path=tmp_path / "gmail-sa.json",
+            delegated_user_email="robot@example.com",
+        ),
+    )
+    message_ids = [f"mid-{index}" for index in range(6)]
+
+    def _fake_parse(message: GmailMessage, default_currency: str) -> ParsedReceipt:
+        parsed = _build_parsed_receipt(tmp_path)
+        return ParsedReceipt(
+            source_pdf=parsed.source_pdf,
+            receipt_id=message.message_id,
+            receipt_date=parsed.receipt_date,
+            currency=default_currency,
+            subscriptions=parsed.subscriptions,
+            tax_total=parsed.tax_total,
+            grand_total=parsed.grand_total,
+            raw_text=parsed.raw_text,
+        )
+
+    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
+    monkeypatch.setattr(
+        service,
+        "fetch_gmail_messages",
+        lambda _cfg: [GmailMessage(message_id=message_id, raw_bytes=b"raw") for message_id in message_ids],
+    )
+    monkeypatch.setattr(service, "_parse_gmail_message", _fake_parse)
+    monkeypatch.setattr(service, "match_subscriptions", lambda _subs, _cfg: matched)
+    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
+    monkeypatch.setattr(service, "_list_ynab_transactions_by_account", lambda **_: [])
+    monkeypatch.setattr(service, "_post_ynab_transaction", lambda **_: "tx")
+
+    result = process_receipt(receipt_path=None, config_path=tmp_path / "config.yaml", dry_run=False)
+
+    logged_ids = [
+        json.loads(line)["receipt"]["receipt_id"] for line in log_path.read_text(encoding="utf-8").splitlines()
+    ]
+    assert result.processed_count == len(message_ids)
+    assert result.created_count == len(message_ids)
+    assert logged_ids == message_ids
+
+
+@pytest.mark.parametrize("failing_stage", ["parse", "match"])
+@pytest.mark.parametrize("failing_index", [0, 2])
+def test_process_receipt_gmail_mode_stops_batch_after_failed_receipt(
+    tmp_path: Path, monkeypatch, failing_index: int, failing_stage: str
+) -> None:
+    split_lines = _build_split_lines()
+    log_path = tmp_path / "run.log"
+    runtime_config = replace(
+        _build_runtime_config(log_path=log_path),
+        app=AppConfig(mode="email", log_path=log_path),
+        email=EmailConfig(
+            service_account_key_path=tmp_path / "gmail-sa.json",
+            delegated_user_email="robot@example.com",
+        ),
+    )
+    message_ids = [f"mid-{index}" for index in range(5)]
+    posted: list[str] = []
+
+    def _fake_parse(message: GmailMessage, default_currency: str) -> ParsedReceipt:
+        if failing_stage == "parse" and message.message_id == message_ids[failing_index]:
+            raise ReceiptParseError(f"Unparseable message: {message.message_id}")
+        return replace(
+            _build_parsed_receipt(tmp_path),
+            receipt_id=message.message_id,
+            subscriptions=[SubscriptionLine(description=message.message_id, base_amount=Decimal("10.00"))],
+        )
+
+    def _fake_match(subscriptions: list[SubscriptionLine], _cfg: object) -> list[MatchedSubscription]:
+        if failing_stage == "match" and subscriptions[0].description == message_ids[failing_index]:
+            raise UnmappedSubscriptionError(f"Unmapped subscription: {subscriptions[0].description}")
+        return _build_matched()
+
+    def _fake_post(**kwargs: object) -> str:
+        posted.append(str(kwargs["transaction"]["memo"]))
+        return f"tx-{len(posted)}"
+
+    monkeypatch.setattr(service, "GMAIL_BATCH_MAX_WORKERS", 1)
+    monkeypatch.setattr(service, "load_config", lambda _path: runtime_config)
+    monkeypatch.setattr(
+        service,
+        "fetch_gmail_messages",
+        lambda _cfg: [GmailMessage(message_id=message_id, raw_bytes=b"raw") for message_id in message_ids],
+    )
+    monkeypatch.setattr(service, "_parse_gmail_message", _fake_parse)
+    monkeypatch.setattr(service, "match_subscriptions", _fake_match)
+    monkeypatch.setattr(service, "build_split_lines", lambda _matched, _tax: split_lines)
+    monkeypatch.setattr(service, "_list_ynab_transactions_by_account", lambda **_: [])
+    monkeypatch.setattr(service, "_post_ynab_transaction", _fake_post)
+
+    expected_error = ReceiptParseError if failing_stage == "parse" else UnmappedSubscriptionError
+    with pytest.raises(expected_error):
+        process_receipt(receipt_path=None, config_path=tmp_path / "config.yaml", dry_run=False)
+
+    events = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    stopped = next(event for event in events if event["event_name"] == "gmail_batch_stopped")
+    assert posted == [f"Receipt: {message_id}" for message_id in message_ids[:failing_index]]
+    assert stopped["failed_message_id"] == message_ids[failing_index]
+    assert [item["message_id"] for item in stopped["posted_receipts"]] == message_ids[:failing_index]
+    assert stopped["unprocessed_message_ids"] == message_ids[failing_index + 1 :]
+    assert events[-1]["event_name"] == "receipt_run_failed"
+
+
+def test_get_ynab_api_client_reuses_client_per_host_and_token(monkeypatch) -> None:
+    created: list[object] = []
+
+    def _fake_api_client(configuration: object) -> object:
+        client = SimpleNamespace(configuration=configuration)
+        created.append(client)
+        return client
+
+    fake_ynab = SimpleNamespace(Configuration=lambda access_token: SimpleNamespace(), ApiClient=_fake_api_client)
+    monkeypatch.setattr(service, "_ynab_api_clients", {})
+
+    first = service._get_ynab_api_client(fake_ynab, "https://ynab.test/v1", "token-1")
+    second = service._get_ynab_api_client(fake_ynab, "https://ynab.test/v1", "token-1")
+    other = service._get_ynab_api_client(fake_ynab, "https://ynab.test/v1", "token-2")
+
+    assert first is second
+    assert other is not first
+    assert len(created) == 2
+
+
+def _build_split_transaction() -> dict[str, object]:
+    return build_parent_transaction(
+        account_id="acct-1",
+        receipt_id="RID-1",
+        receipt_date=date(2026, 2, 16),
+        split_lines=[
+            SplitLine(
+                source_description=name,
+                base_milliunits=5000,
+                tax_milliunits=400,
+                total_milliunits=5400,
+                ynab_category_id="cat-1",
+                ynab_payee_id=None,
+                ynab_payee_name=name,
+                mapping_rule_id=name.lower(),
+            )
+            for name in ("Apple Music", "iCloud")
+        ],
+        grand_total_milliunits=10800,
+        ynab_flag_color="yellow",
+    )
+
+
+def test_post_ynab_transaction_sends_sdk_models_through_transactions_api(monkeypatch) -> None:
+    create_calls: list[tuple[tuple[object, ...], dict[str, object]]] = []
+
+    class _FakeTransactionsApi:
+        def __init__(self, api_client: object) -> None:
+            self.api_client = api_client
+
+        def create_transaction(self, *args: object, **kwargs: object) -> object:
+            create_calls.append((args, kwargs))
+            return {"data": {"transaction": {"id": "tx-created"}}}
+
+    fake_ynab = SimpleNamespace(
+        Configuration=lambda access_token: SimpleNamespace(),
+        ApiClient=lambda configuration: SimpleNamespace(),
+        ApiException=None,
+        TransactionsApi=_FakeTransactionsApi,
+        SaveSubTransaction=lambda **kwargs: SimpleNamespace(**kwargs),
+        NewTransaction=lambda **kwargs: SimpleNamespace(**kwargs),
+        PostTransactionsWrapper=lambda transaction: SimpleNamespace(transaction=transaction),
+    )
+    monkeypatch.setattr(service, "_load_ynab_module", lambda: fake_ynab)
+    monkeypatch.setattr(service, "_ynab_api_clients", {})
+
+    transaction_id = service._post_ynab_transaction(
+        ynab_budget_id="budget-1",
+        ynab_api_token="token-1",
+        ynab_api_url="https://ynab.test/v1",
+        transaction=_build_split_transaction(),
+    )
+
+    assert transaction_id == "tx-created"
+    assert len(create_calls) == 1
+    args, kwargs = create_calls[0]
+    budget_id, wrapper = args
+    assert budget_id == "budget-1"
+    assert kwargs == {"_request_timeout": service.YNAB_REQUEST_TIMEOUT_SECONDS}
+    assert wrapper.transaction.flag_color == "yellow"
+    assert [item.payee_name for item in wrapper.transaction.subtransactions] == ["Apple Music", "iCloud"]
+
+
+def test_post_transactions_wrapper_serializes_without_null_fields() -> None:
+    ynab = pytest.importorskip("ynab")
+
+    wrapper = service._build_post_transactions_wrapper(ynab, _build_split_transaction())
+    body = ynab.ApiClient(ynab.Configuration(access_token="token-1")).sanitize_for_serialization(wrapper)
+
+    transaction = body["transaction"]
+    assert transaction["amount"] == -10800
+    assert transaction["flag_color"] == "yellow"
+    assert "category_id" not in transaction
+    assert "payee_id" not in transaction
+    assert [item["amount"] for item in transaction["subtransactions"]] == [-5400, -5400]
+    assert all("payee_id" not in item for item in transaction["subtransactions"])
+
+
+def test_delete_ynab_transactions_reports_every_failed_delete(tmp_path: Path, monkeypatch) -> None:
+    runtime_config = _build_runtime_config(log_path=tmp_path / "run.log")
+    attempted: list[str] = []
+
+    def _fake_delete(**kwargs: object) -> str:
+        transaction_id = str(kwargs["transaction_id"])
+        attempted.append(transaction_id)
+        if transaction_id != "dup-ok":
+            raise YnabApiError(f"Could not delete {transaction_id}.")
+        return transaction_id
+
+    monkeypatch.setattr(service, "_delete_ynab_transaction", _fake_delete)
+
+    with pytest.raises(YnabApiError, match="2 of 3") as exc_info:
+        service._delete_ynab_transactions(runtime_config, ["dup-a", "dup-ok", "dup-b"])
+
+    assert sorted(attempted) == ["dup-a", "dup-b", "dup-ok"]
+    assert "dup-a" in str(exc_info.value)
+    assert "dup-b" in str(exc_info.value)
+
+
+def test_plan_uncleared_line_matches_assigns_each_candidate_once_oldest_first(tmp_path: Path, monkeypatch) -> None:
+    split_lines = _build_split_lines() * 3
+    runtime_config = _build_runtime_config(log_path=tmp_path / "run.log")
+    monkeypatch.setattr(
+        service,
+        "_list_ynab_transactions_by_account",
+        lambda **_: [
+            _build_uncleared_candidate("tx-b", "2026-02-10", -10800),
+            _build_uncleared_candidate("tx-other", "2026-02-01", -10800, payee_name="Apple TV"),
+            _build_uncleared_candidate("tx-a", "2026-02-03", -10800),
+        ],
+    )
+
+    candidates = service._load_existing_uncleared_transaction_candidates(
+        runtime_config=runtime_config,
+        account_id="acct-1",
+        log_to_stdout=False,
+        dry_run=False,
+    )
+    planned = service._plan_uncleared_line_matches(split_lines, 10800, candidates)
+
+    assert [(match.line_index, match.transaction_id) for match in planned] == [(0, "tx-a"), (1, "tx-b")]
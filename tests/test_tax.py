@@ -13,3 +13,7 @@ def test_allocate_zero_tax() -> None:
     allocated = allocate_proportional_milliunits([1000, 2000, 3000], 0)
     assert allocated == [0, 0, 0]
 
+
+def test_allocate_tax_breaks_remainder_ties_by_line_order() -> None:
+    allocated = allocate_proportional_milliunits([1000, 1000, 1000], 2)
+    assert allocated == [1, 1, 0]
@@ -0,0 +1,16 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+from apple_receipt_to_ynab.utils import MILLIUNIT_FACTOR, dollars_to_milliunits
+
+
+@pytest.mark.parametrize(
+    "amount",
+    ["0", "10", "10.8", "10.80", "-4.99", "1234.567", "0.0005", "0.0015", "-2.3456", "1E+2"],
+)
+def test_dollars_to_milliunits_matches_rounded_decimal_conversion(amount: str) -> None:
+    value = Decimal(amount)
+    expected = int((value * MILLIUNIT_FACTOR).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+    assert dollars_to_milliunits(value) == expected